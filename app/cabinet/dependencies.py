@@ -1,5 +1,7 @@
 """FastAPI dependencies for cabinet module."""
 
+import functools
+
 import structlog
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
@@ -267,10 +269,15 @@ async def get_current_admin_user(
     )
 
 
+@functools.cache
 def require_permission(*permissions: str):
     """
     FastAPI dependency factory for RBAC permission checks.
 
+    Memoized per permission tuple: every route asking for the same permissions
+    shares one dependency callable, so FastAPI introspects it once and the
+    per-request dependency cache deduplicates repeated checks.
+
     Usage::
 
         @router.get("/users", dependencies=[Depends(require_permission("users:read"))])
@@ -283,6 +290,10 @@ def require_permission(*permissions: str):
     if not permissions:
         raise ValueError('require_permission() requires at least one permission argument')
 
+    # Extract resource_type from the first permission (section before ':')
+    first_perm = permissions[0]
+    resource_type = first_perm.split(':', maxsplit=1)[0] if ':' in first_perm else None
+
     async def dependency(
         request: Request,
         user: User = Depends(get_current_cabinet_user),
@@ -297,13 +308,6 @@ def require_permission(*permissions: str):
             client_ip = 'unknown'
         user_agent = request.headers.get('user-agent', '')
 
-        # Extract resource_type from the first permission (section before ':')
-        resource_type = None
-        if permissions:
-            first_perm = permissions[0]
-            if ':' in first_perm:
-                resource_type = first_perm.split(':', maxsplit=1)[0]
-
         for perm in permissions:
             allowed, reason = await PermissionService.check_permission(
                 db,
@@ -1,6 +1,7 @@
 """Cabinet API routes."""
 
 from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
 
 from .account_linking import merge_router as merge_router, router as account_linking_router
 from .admin_apps import router as admin_apps_router
@@ -65,8 +66,8 @@ from .wheel import router as wheel_router
 from .withdrawal import router as withdrawal_router
 
 
-# Main cabinet router
-router = APIRouter(prefix='/cabinet', tags=['Cabinet'])
+# Main cabinet router (orjson encodes large list/overview payloads several times faster)
+router = APIRouter(prefix='/cabinet', tags=['Cabinet'], default_response_class=ORJSONResponse)
 
 # Include all sub-routers
 router.include_router(auth_router)
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import csv
 import io
 from datetime import UTC, datetime
@@ -73,6 +74,11 @@ _CSV_COLUMNS = [
 ]
 
 
+# Exports larger than this are serialized in a worker thread so a big CSV
+# doesn't block the event loop; smaller ones aren't worth the thread hop.
+_CSV_THREAD_THRESHOLD = 1000
+
+
 def _sanitize_csv_cell(value: str) -> str:
     """Prevent CSV formula injection by prefixing dangerous leading characters."""
     if value and value[0] in ('=', '+', '-', '@', '\t', '\r'):
@@ -190,7 +196,10 @@ async def export_audit_logs(
         offset=0,
     )
 
-    csv_content = _logs_to_csv(logs)
+    if len(logs) > _CSV_THREAD_THRESHOLD:
+        csv_content = await asyncio.to_thread(_logs_to_csv, logs)
+    else:
+        csv_content = _logs_to_csv(logs)
     timestamp = datetime.now(UTC).strftime('%Y%m%d_%H%M%S')
     filename = f'audit_log_{timestamp}.csv'
 
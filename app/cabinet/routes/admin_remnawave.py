@@ -1,5 +1,8 @@
 """Admin routes for RemnaWave management in cabinet."""
 
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
@@ -80,6 +83,13 @@ logger = structlog.get_logger(__name__)
 
 router = APIRouter(prefix='/admin/remnawave', tags=['Cabinet Admin RemnaWave'])
 
+# In-memory cache for panel lists: {key: (timestamp, items)}
+_panel_list_cache: dict[str, tuple[float, list[dict[str, Any]]]] = {}
+_panel_list_inflight: dict[str, asyncio.Task] = {}
+# Bumped on invalidation so loads started before a panel change are not cached
+_panel_list_generation = 0
+_PANEL_LIST_CACHE_TTL = 30  # seconds
+
 
 # ============ Helpers ============
 
@@ -103,6 +113,51 @@ def _ensure_configured(service: RemnaWaveService) -> None:
         )
 
 
+def _on_panel_list_loaded(key: str, generation: int, task: asyncio.Task) -> None:
+    if _panel_list_inflight.get(key) is task:
+        del _panel_list_inflight[key]
+    if task.cancelled() or task.exception() is not None:
+        return
+    items = task.result()
+    # Data loaded before an invalidation may predate the change - don't cache it
+    if generation != _panel_list_generation:
+        return
+    # Empty list usually means the panel request failed - don't pin it in cache
+    if items:
+        _panel_list_cache[key] = (time.monotonic(), items)
+
+
+async def _get_cached_panel_list(
+    key: str, loader: Callable[[], Awaitable[list[dict[str, Any]]]]
+) -> list[dict[str, Any]]:
+    """Return a panel list from the short-TTL cache, loading it at most once concurrently.
+
+    Concurrent callers on a cold key share the same in-flight request instead
+    of each hitting RemnaWave.
+    """
+    cached = _panel_list_cache.get(key)
+    if cached and (time.monotonic() - cached[0]) < _PANEL_LIST_CACHE_TTL:
+        return cached[1]
+
+    task = _panel_list_inflight.get(key)
+    if task is None:
+        generation = _panel_list_generation
+        task = asyncio.create_task(loader())
+        _panel_list_inflight[key] = task
+        task.add_done_callback(lambda t: _on_panel_list_loaded(key, generation, t))
+
+    # shield: a cancelled request must not cancel the load for other waiters
+    return await asyncio.shield(task)
+
+
+def _invalidate_panel_lists() -> None:
+    global _panel_list_generation
+    _panel_list_generation += 1
+    _panel_list_cache.clear()
+    # Later callers must not join a load that started before the change
+    _panel_list_inflight.clear()
+
+
 def _parse_datetime(value: Any) -> datetime | None:
     """Parse datetime from various formats."""
     if isinstance(value, datetime):
@@ -244,7 +299,7 @@ async def list_nodes(
     service = _get_service()
     _ensure_configured(service)
 
-    nodes = await service.get_all_nodes()
+    nodes = await _get_cached_panel_list('nodes', service.get_all_nodes)
     serialized = [_serialize_node(node) for node in nodes]
 
     return NodesListResponse(items=serialized, total=len(serialized))
@@ -258,7 +313,7 @@ async def get_nodes_overview(
     service = _get_service()
     _ensure_configured(service)
 
-    nodes = await service.get_all_nodes()
+    nodes = await _get_cached_panel_list('nodes', service.get_all_nodes)
 
     total = len(nodes)
     online = sum(1 for n in nodes if n.get('is_connected') and not n.get('is_disabled'))
@@ -375,6 +430,7 @@ async def perform_node_action(
             )
 
     success = await service.manage_node(node_uuid, payload.action)
+    _invalidate_panel_lists()
 
     messages = {
         'enable': 'Node enabled',
@@ -406,6 +462,7 @@ async def restart_all_nodes(
     _ensure_configured(service)
 
     success = await service.restart_all_nodes()
+    _invalidate_panel_lists()
 
     if success:
         logger.info('Admin restarted all nodes', telegram_id=admin.telegram_id)
@@ -429,7 +486,7 @@ async def list_squads(
     _ensure_configured(service)
 
     # Get squads from RemnaWave
-    rw_squads = await service.get_all_squads()
+    rw_squads = await _get_cached_panel_list('squads', service.get_all_squads)
 
     # Get local squads from DB
     local_squads, _ = await get_all_server_squads(db, page=1, limit=1000)
@@ -513,6 +570,7 @@ async def create_squad(
     _ensure_configured(service)
 
     squad_uuid = await service.create_squad(payload.name, payload.inbound_uuids)
+    _invalidate_panel_lists()
 
     if squad_uuid:
         logger.info(
@@ -550,6 +608,7 @@ async def update_squad(
         name=payload.name,
         inbounds=payload.inbound_uuids,
     )
+    _invalidate_panel_lists()
 
     if success:
         logger.info('Admin updated squad', telegram_id=admin.telegram_id, squad_uuid=squad_uuid)
@@ -600,6 +659,8 @@ async def perform_squad_action(
         success = await service.update_squad_inbounds(squad_uuid, payload.inbound_uuids)
         message = 'Inbounds updated' if success else 'Failed to update inbounds'
 
+    _invalidate_panel_lists()
+
     if success:
         logger.info('Admin performed on squad', telegram_id=admin.telegram_id, action=action, squad_uuid=squad_uuid)
 
@@ -616,6 +677,7 @@ async def delete_squad(
     _ensure_configured(service)
 
     success = await service.delete_squad(squad_uuid)
+    _invalidate_panel_lists()
 
     if success:
         logger.info('Admin deleted squad', telegram_id=admin.telegram_id, squad_uuid=squad_uuid)
@@ -698,6 +760,7 @@ async def migrate_squad_users(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail=str(exc),
         )
+    _invalidate_panel_lists()
 
     if not result.get('success'):
         return MigrationResponse(
@@ -897,6 +960,7 @@ async def sync_servers(
         )
 
     created, updated, removed = await sync_with_remnawave(db, squads)
+    _invalidate_panel_lists()
 
     try:
         await cache.delete_pattern('available_countries*')
@@ -10,7 +10,7 @@ from pydantic import BaseModel
 from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.crud.campaign import get_campaign_statistics, get_campaigns_count, get_campaigns_list
+from app.database.crud.campaign import get_campaigns_count, get_campaigns_list, get_campaigns_summary_statistics
 from app.database.crud.server_squad import get_server_statistics
 from app.database.crud.subscription import get_subscriptions_statistics
 from app.database.crud.transaction import REAL_PAYMENT_METHODS, get_revenue_by_period, get_transactions_statistics
@@ -789,8 +789,10 @@ async def get_top_campaigns(
         total_registrations = 0
         total_revenue = 0
 
+        campaigns_stats = await get_campaigns_summary_statistics(db, [campaign.id for campaign in campaigns])
+
         for campaign in campaigns:
-            stats = await get_campaign_statistics(db, campaign.id)
+            stats = campaigns_stats[campaign.id]
 
             campaign_items.append(
                 TopCampaignItem(
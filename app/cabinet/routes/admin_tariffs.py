@@ -15,6 +15,7 @@ from app.database.crud.tariff import (
     get_all_tariffs,
     get_tariff_by_id,
     get_tariff_subscriptions_count,
+    get_tariffs_subscriptions_counts,
     load_period_prices_from_db,
     reorder_tariffs,
     set_tariff_promo_groups,
@@ -117,10 +118,10 @@ async def list_tariffs(
 ):
     """Get list of all tariffs."""
     tariffs = await get_all_tariffs(db, include_inactive=include_inactive)
+    subs_counts = await get_tariffs_subscriptions_counts(db, [tariff.id for tariff in tariffs])
 
     items = []
     for tariff in tariffs:
-        subs_count = await get_tariff_subscriptions_count(db, tariff.id)
         items.append(
             TariffListItem(
                 id=tariff.id,
@@ -137,7 +138,7 @@ async def list_tariffs(
                 tier_level=tariff.tier_level,
                 display_order=tariff.display_order,
                 servers_count=len(tariff.allowed_squads or []),
-                subscriptions_count=subs_count,
+                subscriptions_count=subs_counts.get(tariff.id, 0),
                 created_at=tariff.created_at,
             )
         )
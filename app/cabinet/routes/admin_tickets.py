@@ -12,7 +12,7 @@ from sqlalchemy.orm import selectinload
 
 from app.cabinet.routes.websocket import notify_user_ticket_reply
 from app.config import settings
-from app.database.crud.ticket import TicketCRUD
+from app.database.crud.ticket import TicketCRUD, TicketMessageCRUD
 from app.database.crud.ticket_notification import TicketNotificationCRUD
 from app.database.models import Ticket, TicketMessage, User
 
@@ -181,15 +181,8 @@ def _user_to_info(user: User) -> AdminTicketUserInfo:
     )
 
 
-def _ticket_to_admin_response(ticket: Ticket, include_messages: bool = False) -> AdminTicketResponse:
+def _ticket_to_admin_response(ticket: Ticket, last_message: TicketMessage | None) -> AdminTicketResponse:
     """Convert Ticket to admin response."""
-    last_message = None
-    messages_count = len(ticket.messages) if ticket.messages else 0
-
-    if ticket.messages:
-        last_msg = max(ticket.messages, key=lambda m: m.created_at)
-        last_message = _message_to_response(last_msg)
-
     user_info = None
     if hasattr(ticket, 'user') and ticket.user:
         user_info = _user_to_info(ticket.user)
@@ -202,9 +195,9 @@ def _ticket_to_admin_response(ticket: Ticket, include_messages: bool = False) ->
         created_at=ticket.created_at,
         updated_at=ticket.updated_at or ticket.created_at,
         closed_at=ticket.closed_at,
-        messages_count=messages_count,
+        messages_count=ticket.message_count or 0,
         user=user_info,
-        last_message=last_message,
+        last_message=_message_to_response(last_message) if last_message else None,
     )
 
 
@@ -356,7 +349,7 @@ async def get_all_tickets(
 ):
     """Get all tickets for admin."""
     # Base query with user relationship
-    query = select(Ticket).options(selectinload(Ticket.messages), selectinload(Ticket.user))
+    query = select(Ticket).options(selectinload(Ticket.user))
 
     # Build count query
     count_query = select(func.count()).select_from(Ticket)
@@ -385,7 +378,11 @@ async def get_all_tickets(
     result = await db.execute(query)
     tickets = result.scalars().all()
 
-    items = [_ticket_to_admin_response(t) for t in tickets]
+    # Only the last message is shown in the list, so don't load whole conversations
+    ticket_ids = [t.id for t in tickets]
+    last_messages = await TicketMessageCRUD.get_last_messages(db, ticket_ids)
+
+    items = [_ticket_to_admin_response(t, last_messages.get(t.id)) for t in tickets]
     pages = math.ceil(total / per_page) if total > 0 else 1
 
     return AdminTicketListResponse(
@@ -468,7 +465,7 @@ async def reply_to_ticket(
         media_caption=request.media_caption if has_media else None,
         created_at=datetime.now(UTC),
     )
-    db.add(message)
+    await TicketMessageCRUD.insert_message(db, message)
 
     # Update ticket status to answered
     ticket.status = 'answered'
@@ -14,6 +14,7 @@ from app.database.crud.subscription import (
     extend_subscription,
 )
 from app.database.crud.tariff import get_tariff_by_id
+from app.database.crud.ticket import TicketMessageCRUD
 from app.database.crud.user import (
     add_user_balance,
     delete_user as soft_delete_user,
@@ -1998,8 +1999,12 @@ async def delete_user(
         await soft_delete_user(db, user)
         action = 'soft deleted'
     else:
-        # Hard delete
+        # Hard delete. FK cascade also removes the user's replies in other users' tickets,
+        # so their message stats are recounted after the flush
+        affected_ticket_ids = await TicketMessageCRUD.get_ticket_ids_with_user_messages(db, user.id)
         await db.delete(user)
+        await db.flush()
+        await TicketMessageCRUD.recalculate_ticket_stats(db, affected_ticket_ids)
         await db.commit()
         action = 'permanently deleted'
 
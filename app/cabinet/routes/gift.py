@@ -294,10 +294,12 @@ async def create_gift_purchase(
 
         # 1) Check local DB — user may already be registered in the bot
         db_result = await db.execute(
-            select(User.telegram_id).where(
+            select(User.telegram_id)
+            .where(
                 func.lower(User.username) == normalized_username,
                 User.telegram_id.isnot(None),
             )
+            .limit(1)
         )
         db_telegram_id = db_result.scalar_one_or_none()
 
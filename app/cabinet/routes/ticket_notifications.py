@@ -4,7 +4,7 @@ from datetime import datetime
 
 import structlog
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.crud.ticket_notification import TicketNotificationCRUD
@@ -35,6 +35,10 @@ class TicketNotificationResponse(BaseModel):
         from_attributes = True
 
 
+# Validates a whole page of ORM rows in one call into the compiled validator
+_notification_list_adapter = TypeAdapter(list[TicketNotificationResponse])
+
+
 class TicketNotificationListResponse(BaseModel):
     """List of ticket notifications."""
 
@@ -58,13 +62,12 @@ async def get_user_notifications(
     db: AsyncSession = Depends(get_cabinet_db),
 ):
     """Get ticket notifications for current user."""
-    notifications = await TicketNotificationCRUD.get_user_notifications(
+    notifications, unread_count = await TicketNotificationCRUD.get_user_notifications_with_unread_count(
         db, user.id, unread_only=unread_only, limit=limit, offset=offset
     )
-    unread_count = await TicketNotificationCRUD.count_unread_user(db, user.id)
 
     return TicketNotificationListResponse(
-        items=[TicketNotificationResponse.model_validate(n) for n in notifications],
+        items=_notification_list_adapter.validate_python(notifications, from_attributes=True),
         unread_count=unread_count,
     )
 
@@ -86,7 +89,11 @@ async def mark_notification_as_read(
     db: AsyncSession = Depends(get_cabinet_db),
 ):
     """Mark a notification as read."""
-    # Security: Verify notification belongs to current user and is not an admin notification
+    # Security: the UPDATE is scoped to the user's own non-admin notifications
+    if await TicketNotificationCRUD.mark_as_read(db, notification_id, user_id=user.id, is_for_admin=False):
+        return {'success': True}
+
+    # Nothing updated - look up the row only to report the right error
     notification = await TicketNotificationCRUD.get_by_id(db, notification_id)
     if not notification:
         raise HTTPException(
@@ -94,15 +101,10 @@ async def mark_notification_as_read(
             detail='Notification not found',
         )
 
-    # Check ownership: notification must belong to user and not be an admin notification
-    if notification.user_id != user.id or notification.is_for_admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to mark this notification as read",
-        )
-
-    await TicketNotificationCRUD.mark_as_read(db, notification_id)
-    return {'success': True}
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="You don't have permission to mark this notification as read",
+    )
 
 
 @router.post('/read-all')
@@ -136,13 +138,12 @@ async def get_admin_notifications(
     db: AsyncSession = Depends(get_cabinet_db),
 ):
     """Get ticket notifications for admins."""
-    notifications = await TicketNotificationCRUD.get_admin_notifications(
+    notifications, unread_count = await TicketNotificationCRUD.get_admin_notifications_with_unread_count(
         db, unread_only=unread_only, limit=limit, offset=offset
     )
-    unread_count = await TicketNotificationCRUD.count_unread_admin(db)
 
     return TicketNotificationListResponse(
-        items=[TicketNotificationResponse.model_validate(n) for n in notifications],
+        items=_notification_list_adapter.validate_python(notifications, from_attributes=True),
         unread_count=unread_count,
     )
 
@@ -164,7 +165,11 @@ async def mark_admin_notification_as_read(
     db: AsyncSession = Depends(get_cabinet_db),
 ):
     """Mark an admin notification as read."""
-    # Security: Verify notification exists and is an admin notification
+    # Security: the UPDATE only touches admin notifications
+    if await TicketNotificationCRUD.mark_as_read(db, notification_id, is_for_admin=True):
+        return {'success': True}
+
+    # Nothing updated - look up the row only to report the right error
     notification = await TicketNotificationCRUD.get_by_id(db, notification_id)
     if not notification:
         raise HTTPException(
@@ -172,15 +177,10 @@ async def mark_admin_notification_as_read(
             detail='Notification not found',
         )
 
-    # Check that this is actually an admin notification
-    if not notification.is_for_admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail='This is not an admin notification',
-        )
-
-    await TicketNotificationCRUD.mark_as_read(db, notification_id)
-    return {'success': True}
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail='This is not an admin notification',
+    )
 
 
 @admin_router.post('/read-all')
@@ -11,6 +11,7 @@ from sqlalchemy.orm import selectinload
 
 from app.cabinet.routes.websocket import notify_admins_new_ticket, notify_admins_ticket_reply
 from app.config import settings
+from app.database.crud.ticket import TicketMessageCRUD
 from app.database.crud.ticket_notification import TicketNotificationCRUD
 from app.database.models import Ticket, TicketMessage, User
 from app.handlers.tickets import notify_admins_about_new_ticket, notify_admins_about_ticket_reply
@@ -45,15 +46,8 @@ def _message_to_response(message: TicketMessage) -> TicketMessageResponse:
     )
 
 
-def _ticket_to_response(ticket: Ticket, include_last_message: bool = True) -> TicketResponse:
+def _ticket_to_response(ticket: Ticket, last_message: TicketMessage | None) -> TicketResponse:
     """Convert Ticket to response."""
-    last_message = None
-    messages_count = len(ticket.messages) if ticket.messages else 0
-
-    if include_last_message and ticket.messages:
-        last_msg = max(ticket.messages, key=lambda m: m.created_at)
-        last_message = _message_to_response(last_msg)
-
     return TicketResponse(
         id=ticket.id,
         title=ticket.title or f'Ticket #{ticket.id}',
@@ -62,8 +56,8 @@ def _ticket_to_response(ticket: Ticket, include_last_message: bool = True) -> Ti
         created_at=ticket.created_at,
         updated_at=ticket.updated_at or ticket.created_at,
         closed_at=ticket.closed_at,
-        messages_count=messages_count,
-        last_message=last_message,
+        messages_count=ticket.message_count or 0,
+        last_message=_message_to_response(last_message) if last_message else None,
     )
 
 
@@ -84,7 +78,7 @@ async def get_tickets(
         )
 
     # Base query
-    query = select(Ticket).where(Ticket.user_id == user.id).options(selectinload(Ticket.messages))
+    query = select(Ticket).where(Ticket.user_id == user.id)
 
     # Filter by status
     if status_filter:
@@ -105,7 +99,11 @@ async def get_tickets(
     result = await db.execute(query)
     tickets = result.scalars().all()
 
-    items = [_ticket_to_response(t) for t in tickets]
+    # Only the last message is shown in the list, so don't load whole conversations
+    ticket_ids = [t.id for t in tickets]
+    last_messages = await TicketMessageCRUD.get_last_messages(db, ticket_ids)
+
+    items = [_ticket_to_response(t, last_messages.get(t.id)) for t in tickets]
     pages = math.ceil(total / per_page) if total > 0 else 1
 
     return TicketListResponse(
@@ -154,7 +152,7 @@ async def create_ticket(
         media_caption=request.media_caption,
         created_at=datetime.now(UTC),
     )
-    db.add(message)
+    await TicketMessageCRUD.insert_message(db, message)
     await db.commit()
 
     # Refresh to get relationships
@@ -270,7 +268,7 @@ async def add_ticket_message(
         media_caption=request.media_caption,
         created_at=datetime.now(UTC),
     )
-    db.add(message)
+    await TicketMessageCRUD.insert_message(db, message)
 
     # Update ticket status and timestamp
     if ticket.status == 'answered':
@@ -1,7 +1,7 @@
 from datetime import UTC, datetime
 
 import structlog
-from sqlalchemy import and_, delete, func, select, update
+from sqlalchemy import and_, case, delete, exists, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -409,6 +409,80 @@ async def get_campaign_statistics(
     }
 
 
+async def get_campaigns_summary_statistics(
+    db: AsyncSession,
+    campaign_ids: list[int],
+) -> dict[int, dict[str, int | float]]:
+    """Сводная статистика для списка кампаний фиксированным числом запросов.
+
+    Возвращает те же значения registrations / total_revenue_kopeks /
+    conversion_count / conversion_rate / avg_revenue_per_user_kopeks, что и
+    get_campaign_statistics, но группировкой по campaign_id вместо ~10
+    запросов на каждую кампанию.
+    """
+    if not campaign_ids:
+        return {}
+
+    registration = AdvertisingCampaignRegistration
+    has_subscription_payment = exists().where(
+        Transaction.user_id == registration.user_id,
+        Transaction.type == TransactionType.SUBSCRIPTION_PAYMENT.value,
+        Transaction.is_completed.is_(True),
+    )
+    has_conversion = exists().where(SubscriptionConversion.user_id == registration.user_id)
+
+    # (campaign_id, user_id) уникальны, поэтому подсчёт строк = подсчёт пользователей
+    users_result = await db.execute(
+        select(
+            registration.campaign_id,
+            func.count(registration.id),
+            func.count(case((has_subscription_payment | has_conversion, 1))),
+            func.count(case((User.has_had_paid_subscription.is_(True), 1))),
+        )
+        .outerjoin(User, User.id == registration.user_id)
+        .where(registration.campaign_id.in_(campaign_ids))
+        .group_by(registration.campaign_id)
+    )
+
+    # Only count real deposits (exclude promo bonuses, wheel prizes, admin top-ups)
+    deposits_result = await db.execute(
+        select(registration.campaign_id, func.coalesce(func.sum(Transaction.amount_kopeks), 0))
+        .join(Transaction, Transaction.user_id == registration.user_id)
+        .where(
+            registration.campaign_id.in_(campaign_ids),
+            Transaction.type == TransactionType.DEPOSIT.value,
+            Transaction.is_completed.is_(True),
+            Transaction.payment_method.in_(REAL_PAYMENT_METHODS),
+        )
+        .group_by(registration.campaign_id)
+    )
+    deposits_by_campaign = {campaign_id: int(total or 0) for campaign_id, total in deposits_result.all()}
+
+    stats: dict[int, dict[str, int | float]] = {
+        campaign_id: {
+            'registrations': 0,
+            'total_revenue_kopeks': deposits_by_campaign.get(campaign_id, 0),
+            'conversion_count': 0,
+            'conversion_rate': 0.0,
+            'avg_revenue_per_user_kopeks': 0,
+        }
+        for campaign_id in campaign_ids
+    }
+
+    for campaign_id, count, paid_users, paid_users_from_flag in users_result.all():
+        count = count or 0
+        paid_users = paid_users or 0
+        paid_users_count = max(paid_users, paid_users_from_flag or 0)
+        entry = stats[campaign_id]
+        entry['registrations'] = count
+        entry['conversion_count'] = paid_users
+        if count:
+            entry['conversion_rate'] = round((paid_users_count / count) * 100, 1)
+            entry['avg_revenue_per_user_kopeks'] = int(entry['total_revenue_kopeks'] / count)
+
+    return stats
+
+
 async def get_campaigns_overview(db: AsyncSession) -> dict[str, int]:
     total = await get_campaigns_count(db)
     active = await get_campaigns_count(db, is_active=True)
@@ -5,6 +5,7 @@ from datetime import UTC, datetime
 import structlog
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.database.models import FreekassaPayment
 
@@ -145,7 +146,9 @@ async def get_expired_pending_payments(
     """Получает просроченные платежи в статусе pending."""
     now = datetime.now(UTC)
     result = await db.execute(
-        select(FreekassaPayment).where(
+        select(FreekassaPayment)
+        .options(selectinload(FreekassaPayment.user))
+        .where(
             FreekassaPayment.status == 'pending',
             FreekassaPayment.is_paid == False,
             FreekassaPayment.expires_at < now,
@@ -5,6 +5,7 @@ from datetime import UTC, datetime
 import structlog
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.database.models import KassaAiPayment
 
@@ -147,7 +148,9 @@ async def get_expired_pending_kassa_ai_payments(
     """Получает просроченные платежи в статусе pending."""
     now = datetime.now(UTC)
     result = await db.execute(
-        select(KassaAiPayment).where(
+        select(KassaAiPayment)
+        .options(selectinload(KassaAiPayment.user))
+        .where(
             KassaAiPayment.status == 'pending',
             KassaAiPayment.is_paid == False,
             KassaAiPayment.expires_at < now,
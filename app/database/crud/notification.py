@@ -28,6 +28,31 @@ async def notification_sent(
     return result.scalars().first() is not None
 
 
+async def get_sent_notification_keys(
+    db: AsyncSession,
+    subscription_ids: list[int],
+    notification_type: str,
+    days_before: int | None = None,
+    *,
+    chunk_size: int = 1000,
+) -> set[tuple[int, int]]:
+    """Вернуть пары (user_id, subscription_id), по которым уведомление уже отправлено (батч для notification_sent).
+
+    ID запрашиваются чанками: число bind-параметров в одном запросе ограничено (asyncpg - 32767).
+    """
+    sent_keys: set[tuple[int, int]] = set()
+    for i in range(0, len(subscription_ids), chunk_size):
+        result = await db.execute(
+            select(SentNotification.user_id, SentNotification.subscription_id).where(
+                SentNotification.subscription_id.in_(subscription_ids[i : i + chunk_size]),
+                SentNotification.notification_type == notification_type,
+                SentNotification.days_before == days_before,
+            )
+        )
+        sent_keys.update((row.user_id, row.subscription_id) for row in result)
+    return sent_keys
+
+
 async def record_notification(
     db: AsyncSession,
     user_id: int,
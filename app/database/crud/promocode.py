@@ -2,6 +2,8 @@ from datetime import UTC, datetime, timedelta
 
 import structlog
 from sqlalchemy import and_, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -92,15 +94,18 @@ async def check_user_promocode_usage(db: AsyncSession, user_id: int, promocode_i
 
 
 async def create_promocode_use(db: AsyncSession, promocode_id: int, user_id: int) -> PromoCodeUse | None:
-    from sqlalchemy.exc import IntegrityError
-
-    promocode_use = PromoCodeUse(promocode_id=promocode_id, user_id=user_id, used_at=datetime.now(UTC))
+    # ON CONFLICT DO NOTHING вместо SAVEPOINT + IntegrityError: один запрос, дубль возвращает None.
+    # Конфликт задаётся колонками uq_promocode_uses_user_promo - так понимают и PostgreSQL, и SQLite
+    dialect_insert = sqlite_insert if db.get_bind().dialect.name == 'sqlite' else pg_insert
+    result = await db.execute(
+        dialect_insert(PromoCodeUse)
+        .values(promocode_id=promocode_id, user_id=user_id, used_at=datetime.now(UTC))
+        .on_conflict_do_nothing(index_elements=[PromoCodeUse.user_id, PromoCodeUse.promocode_id])
+        .returning(PromoCodeUse)
+    )
+    promocode_use = result.scalar_one_or_none()
 
-    try:
-        async with db.begin_nested():
-            db.add(promocode_use)
-            await db.flush()
-    except IntegrityError:
+    if promocode_use is None:
         logger.warning(
             '⚠️ Дублирующая запись использования промокода (race condition)',
             promocode_id=promocode_id,
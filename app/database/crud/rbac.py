@@ -171,17 +171,17 @@ class UserRoleCRUD:
         Returns:
             (sorted_permissions, role_names, max_level)
         """
-        now = datetime.now(UTC)
-        result = await db.execute(
-            select(UserRole)
-            .options(selectinload(UserRole.role))
-            .where(
-                UserRole.user_id == user_id,
-                UserRole.is_active.is_(True),
-            )
-        )
-        user_roles = result.scalars().all()
+        user_roles = await UserRoleCRUD.get_user_roles(db, user_id)
+        return UserRoleCRUD.aggregate_permissions(user_roles)
+
+    @staticmethod
+    def aggregate_permissions(user_roles: list[UserRole]) -> tuple[list[str], list[str], int]:
+        """Aggregate permissions from already loaded user roles, skipping expired and inactive ones.
 
+        Returns:
+            (sorted_permissions, role_names, max_level)
+        """
+        now = datetime.now(UTC)
         permissions: set[str] = set()
         role_names: list[str] = []
         max_level: int = 0
@@ -5,6 +5,7 @@ from datetime import UTC, datetime
 import structlog
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.database.models import RioPayPayment
 
@@ -134,7 +135,9 @@ async def get_expired_pending_riopay_payments(
     """Получает просроченные платежи в статусе pending."""
     now = datetime.now(UTC)
     result = await db.execute(
-        select(RioPayPayment).where(
+        select(RioPayPayment)
+        .options(selectinload(RioPayPayment.user))
+        .where(
             RioPayPayment.status == 'pending',
             RioPayPayment.is_paid == False,
             RioPayPayment.expires_at < now,
@@ -23,14 +23,11 @@ async def get_rules_by_language(db: AsyncSession, language: str = 'ru') -> Servi
 async def create_or_update_rules(
     db: AsyncSession, content: str, language: str = 'ru', title: str = 'Правила сервиса'
 ) -> ServiceRule:
-    existing_rules_result = await db.execute(
-        select(ServiceRule).where(ServiceRule.language == language, ServiceRule.is_active == True)
+    await db.execute(
+        update(ServiceRule)
+        .where(ServiceRule.language == language, ServiceRule.is_active == True)
+        .values(is_active=False, updated_at=datetime.now(UTC))
     )
-    existing_rules = existing_rules_result.scalars().all()
-
-    for rule in existing_rules:
-        rule.is_active = False
-        rule.updated_at = datetime.now(UTC)
 
     new_rules = ServiceRule(title=title, content=content, language=language, is_active=True, order=0)
 
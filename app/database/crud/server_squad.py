@@ -83,6 +83,7 @@ async def create_server_squad(
     db.add(server_squad)
     await db.commit()
     await db.refresh(server_squad)
+    await db.refresh(server_squad, attribute_names=['allowed_promo_groups'])
 
     logger.info('✅ Создан сервер (UUID: )', display_name=display_name, squad_uuid=squad_uuid)
     return server_squad
@@ -228,6 +229,7 @@ async def update_server_squad_promo_groups(
     server.allowed_promo_groups = promo_groups
     await db.commit()
     await db.refresh(server)
+    await db.refresh(server, attribute_names=['allowed_promo_groups'])
 
     logger.info(
         'Обновлены промогруппы сервера %s (ID: %s): %s',
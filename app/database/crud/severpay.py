@@ -5,6 +5,7 @@ from datetime import UTC, datetime
 import structlog
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.database.models import SeverPayPayment
 
@@ -139,7 +140,9 @@ async def get_expired_pending_severpay_payments(
     """Получает просроченные платежи в статусе pending."""
     now = datetime.now(UTC)
     result = await db.execute(
-        select(SeverPayPayment).where(
+        select(SeverPayPayment)
+        .options(selectinload(SeverPayPayment.user))
+        .where(
             SeverPayPayment.status == 'pending',
             SeverPayPayment.is_paid == False,
             SeverPayPayment.expires_at < now,
@@ -1265,12 +1265,13 @@ async def remove_subscription_servers(db: AsyncSession, subscription_id: int, se
         return False
 
 
-async def expire_subscription(db: AsyncSession, subscription: Subscription) -> Subscription:
+async def expire_subscription(db: AsyncSession, subscription: Subscription, *, commit: bool = True) -> Subscription:
     subscription.status = SubscriptionStatus.EXPIRED.value
     subscription.updated_at = datetime.now(UTC)
 
-    await db.commit()
-    await db.refresh(subscription)
+    if commit:
+        await db.commit()
+        await db.refresh(subscription)
 
     logger.info('⏰ Подписка пользователя помечена как истёкшая', user_id=subscription.user_id)
     return subscription
@@ -424,6 +424,19 @@ async def get_tariff_subscriptions_count(db: AsyncSession, tariff_id: int) -> in
     return int(result.scalar_one())
 
 
+async def get_tariffs_subscriptions_counts(db: AsyncSession, tariff_ids: list[int]) -> dict[int, int]:
+    """Подсчитывает количество подписок для нескольких тарифов одним запросом."""
+    if not tariff_ids:
+        return {}
+
+    result = await db.execute(
+        select(Subscription.tariff_id, func.count(Subscription.id))
+        .where(Subscription.tariff_id.in_(tariff_ids))
+        .group_by(Subscription.tariff_id)
+    )
+    return {tariff_id: int(count) for tariff_id, count in result.all()}
+
+
 async def set_tariff_promo_groups(
     db: AsyncSession,
     tariff: Tariff,
@@ -1,9 +1,10 @@
+from collections.abc import Iterable
 from datetime import UTC, datetime
 
 import structlog
-from sqlalchemy import and_, desc, func, or_, select, update
+from sqlalchemy import and_, case, desc, func, literal, or_, select, true, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, selectinload
 
 from app.database.models import SupportAuditLog, Ticket, TicketMessage, TicketStatus
 
@@ -42,7 +43,7 @@ class TicketCRUD:
             media_file_id=media_file_id,
             media_caption=media_caption,
         )
-        db.add(message)
+        await TicketMessageCRUD.insert_message(db, message)
 
         await db.commit()
         await db.refresh(ticket)
@@ -371,6 +372,72 @@ class TicketCRUD:
 class TicketMessageCRUD:
     """CRUD операции для работы с сообщениями тикетов"""
 
+    @staticmethod
+    async def insert_message(db: AsyncSession, message: TicketMessage) -> TicketMessage:
+        """Добавить сообщение в сессию и учесть его в message_count / last_message_at тикета (без commit).
+
+        Все пути создания сообщений идут через этот метод. Счётчик увеличивается атомарным
+        UPDATE ... RETURNING, который сразу обновляет загруженный в сессию тикет. Сообщение с более
+        ранним created_at (например, перенесённое из истории) не сдвигает last_message_at назад.
+        """
+        if message.created_at is None:
+            message.created_at = datetime.now(UTC)
+        db.add(message)
+
+        created_at = literal(message.created_at, Ticket.last_message_at.type)
+        result = await db.execute(
+            update(Ticket)
+            .where(Ticket.id == message.ticket_id)
+            .values(
+                message_count=Ticket.message_count + 1,
+                # Переносимый аналог GREATEST(last_message_at, created_at) с учётом NULL
+                last_message_at=case(
+                    (
+                        or_(Ticket.last_message_at.is_(None), Ticket.last_message_at < created_at),
+                        created_at,
+                    ),
+                    else_=Ticket.last_message_at,
+                ),
+            )
+            .returning(Ticket)
+            .execution_options(populate_existing=True)
+        )
+        result.scalars().all()
+        return message
+
+    @staticmethod
+    async def get_ticket_ids_with_user_messages(db: AsyncSession, user_id: int) -> list[int]:
+        """ID тикетов, где есть сообщения пользователя: после его удаления каскад FK убирает эти сообщения."""
+        result = await db.execute(select(TicketMessage.ticket_id).where(TicketMessage.user_id == user_id).distinct())
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def recalculate_ticket_stats(db: AsyncSession, ticket_ids: Iterable[int] | None = None) -> None:
+        """Пересчитать message_count / last_message_at тикетов по ticket_messages (после удаления сообщений).
+
+        ticket_ids=None пересчитывает все тикеты (после восстановления из бэкапа), не загружая их в сессию.
+        """
+        stmt = update(Ticket).values(
+            message_count=select(func.count(TicketMessage.id))
+            .where(TicketMessage.ticket_id == Ticket.id)
+            .scalar_subquery(),
+            last_message_at=select(func.max(TicketMessage.created_at))
+            .where(TicketMessage.ticket_id == Ticket.id)
+            .scalar_subquery(),
+        )
+        if ticket_ids is None:
+            await db.execute(stmt.execution_options(synchronize_session=False))
+            return
+
+        ticket_ids = list(set(ticket_ids))
+        if not ticket_ids:
+            return
+
+        result = await db.execute(
+            stmt.where(Ticket.id.in_(ticket_ids)).returning(Ticket).execution_options(populate_existing=True)
+        )
+        result.scalars().all()
+
     @staticmethod
     async def add_message(
         db: AsyncSession,
@@ -394,7 +461,7 @@ class TicketMessageCRUD:
             media_caption=media_caption,
         )
 
-        db.add(message)
+        await TicketMessageCRUD.insert_message(db, message)
 
         # Обновляем статус тикета
         ticket = await TicketCRUD.get_ticket_by_id(db, ticket_id, load_messages=False)
@@ -484,3 +551,45 @@ class TicketMessageCRUD:
 
         result = await db.execute(query)
         return result.scalar_one_or_none()
+
+    @staticmethod
+    async def get_last_messages(db: AsyncSession, ticket_ids: list[int]) -> dict[int, TicketMessage]:
+        """Получить последнее сообщение каждого тикета без загрузки всей переписки.
+
+        На PostgreSQL - LATERAL ... LIMIT 1 по индексу (ticket_id, created_at), на SQLite (нет LATERAL) -
+        первая строка оконной нумерации по тикету.
+        """
+        if not ticket_ids:
+            return {}
+
+        newest_first = (desc(TicketMessage.created_at), desc(TicketMessage.id))
+
+        if db.get_bind().dialect.name == 'postgresql':
+            last_message = (
+                select(TicketMessage)
+                .where(TicketMessage.ticket_id == Ticket.id)
+                .order_by(*newest_first)
+                .limit(1)
+                .lateral()
+            )
+            last_message_entity = aliased(TicketMessage, last_message)
+
+            result = await db.execute(
+                select(Ticket.id, last_message_entity).join(last_message, true()).where(Ticket.id.in_(ticket_ids))
+            )
+            return {ticket_id: message for ticket_id, message in result.all()}
+
+        ranked = (
+            select(
+                TicketMessage,
+                func.row_number()
+                .over(partition_by=TicketMessage.ticket_id, order_by=newest_first)
+                .label('message_rank'),
+            )
+            .where(TicketMessage.ticket_id.in_(ticket_ids))
+            .subquery()
+        )
+        ranked_entity = aliased(TicketMessage, ranked)
+
+        result = await db.execute(select(ranked_entity).where(ranked.c.message_rank == 1))
+        return {message.ticket_id: message for message in result.scalars().all()}
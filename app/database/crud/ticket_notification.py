@@ -48,52 +48,72 @@ class TicketNotificationCRUD:
         return notification
 
     @staticmethod
-    async def get_user_notifications(
+    async def _get_page_with_unread_count(
         db: AsyncSession,
-        user_id: int,
-        unread_only: bool = False,
-        limit: int = 50,
-        offset: int = 0,
-    ) -> list[TicketNotification]:
-        """Get notifications for a user (not admin)."""
+        scope: list,
+        unread_only: bool,
+        limit: int,
+        offset: int,
+    ) -> tuple[list[TicketNotification], int]:
+        """Fetch a page of notifications and the scope's unread count in one round trip.
+
+        The unread count is an uncorrelated scalar subquery, evaluated once per
+        statement; it is only queried separately when the page comes back empty.
+        """
+        unread_filter = TicketNotification.is_read == False
+        unread_count_subquery = (
+            select(func.count()).select_from(TicketNotification).where(*scope, unread_filter).scalar_subquery()
+        )
         query = (
-            select(TicketNotification)
-            .where(
-                TicketNotification.user_id == user_id,
-                TicketNotification.is_for_admin == False,
-            )
+            select(TicketNotification, unread_count_subquery)
+            .where(*scope)
             .options(selectinload(TicketNotification.ticket))
             .order_by(desc(TicketNotification.created_at))
         )
 
         if unread_only:
-            query = query.where(TicketNotification.is_read == False)
+            query = query.where(unread_filter)
 
         query = query.offset(offset).limit(limit)
-        result = await db.execute(query)
-        return list(result.scalars().all())
+        rows = (await db.execute(query)).all()
+        if rows:
+            return [row[0] for row in rows], rows[0][1]
+
+        count_query = select(func.count()).select_from(TicketNotification).where(*scope, unread_filter)
+        return [], (await db.execute(count_query)).scalar() or 0
 
     @staticmethod
-    async def get_admin_notifications(
+    async def get_user_notifications_with_unread_count(
         db: AsyncSession,
+        user_id: int,
         unread_only: bool = False,
         limit: int = 50,
         offset: int = 0,
-    ) -> list[TicketNotification]:
-        """Get notifications for admins."""
-        query = (
-            select(TicketNotification)
-            .where(TicketNotification.is_for_admin == True)
-            .options(selectinload(TicketNotification.ticket))
-            .order_by(desc(TicketNotification.created_at))
+    ) -> tuple[list[TicketNotification], int]:
+        """Get a page of user notifications together with the user's unread count."""
+        return await TicketNotificationCRUD._get_page_with_unread_count(
+            db,
+            [TicketNotification.user_id == user_id, TicketNotification.is_for_admin == False],
+            unread_only,
+            limit,
+            offset,
         )
 
-        if unread_only:
-            query = query.where(TicketNotification.is_read == False)
-
-        query = query.offset(offset).limit(limit)
-        result = await db.execute(query)
-        return list(result.scalars().all())
+    @staticmethod
+    async def get_admin_notifications_with_unread_count(
+        db: AsyncSession,
+        unread_only: bool = False,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> tuple[list[TicketNotification], int]:
+        """Get a page of admin notifications together with the admin unread count."""
+        return await TicketNotificationCRUD._get_page_with_unread_count(
+            db,
+            [TicketNotification.is_for_admin == True],
+            unread_only,
+            limit,
+            offset,
+        )
 
     @staticmethod
     async def count_unread_user(db: AsyncSession, user_id: int) -> int:
@@ -125,13 +145,27 @@ class TicketNotificationCRUD:
         return result.scalar() or 0
 
     @staticmethod
-    async def mark_as_read(db: AsyncSession, notification_id: int) -> bool:
-        """Mark a notification as read."""
+    async def mark_as_read(
+        db: AsyncSession,
+        notification_id: int,
+        *,
+        user_id: int | None = None,
+        is_for_admin: bool | None = None,
+    ) -> bool:
+        """Mark a notification as read.
+
+        Optional ``user_id`` / ``is_for_admin`` scope the UPDATE itself, so an
+        ownership check does not need a separate SELECT.
+        """
         query = (
             update(TicketNotification)
             .where(TicketNotification.id == notification_id)
             .values(is_read=True, read_at=datetime.now(UTC))
         )
+        if user_id is not None:
+            query = query.where(TicketNotification.user_id == user_id)
+        if is_for_admin is not None:
+            query = query.where(TicketNotification.is_for_admin == is_for_admin)
         result = await db.execute(query)
         await db.commit()
         return result.rowcount > 0
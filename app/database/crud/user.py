@@ -173,6 +173,25 @@ async def get_user_by_username(db: AsyncSession, username: str) -> User | None:
     return user
 
 
+async def get_users_by_telegram_ids_or_usernames(
+    db: AsyncSession,
+    telegram_ids: set[int],
+    usernames: set[str],
+) -> list[User]:
+    """Resolve a batch of users by telegram_id or case-insensitive username in one query."""
+    conditions = []
+    if telegram_ids:
+        conditions.append(User.telegram_id.in_(telegram_ids))
+    if usernames:
+        conditions.append(func.lower(User.username).in_({username.lower() for username in usernames}))
+
+    if not conditions:
+        return []
+
+    result = await db.execute(select(User).where(or_(*conditions)))
+    return list(result.scalars().all())
+
+
 async def get_user_by_referral_code(db: AsyncSession, referral_code: str) -> User | None:
     result = await db.execute(
         select(User)
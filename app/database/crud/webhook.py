@@ -116,6 +116,8 @@ async def record_webhook_delivery(
     response_body: str | None = None,
     error_message: str | None = None,
     attempt_number: int = 1,
+    *,
+    commit: bool = True,
 ) -> WebhookDelivery:
     """Записать попытку доставки webhook."""
     delivery = WebhookDelivery(
@@ -130,8 +132,9 @@ async def record_webhook_delivery(
         delivered_at=datetime.now(UTC) if status == 'success' else None,
     )
     db.add(delivery)
-    await db.commit()
-    await db.refresh(delivery)
+    if commit:
+        await db.commit()
+        await db.refresh(delivery)
     return delivery
 
 
@@ -139,6 +142,8 @@ async def update_webhook_stats(
     db: AsyncSession,
     webhook: Webhook,
     success: bool,
+    *,
+    commit: bool = True,
 ) -> Webhook:
     """Обновить статистику webhook."""
     if success:
@@ -146,6 +151,7 @@ async def update_webhook_stats(
     else:
         webhook.failure_count += 1
     webhook.last_triggered_at = datetime.now(UTC)
-    await db.commit()
-    await db.refresh(webhook)
+    if commit:
+        await db.commit()
+        await db.refresh(webhook)
     return webhook
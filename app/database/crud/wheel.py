@@ -244,20 +244,26 @@ async def get_user_spin_history(
     db: AsyncSession, user_id: int, limit: int = 20, offset: int = 0
 ) -> tuple[list[WheelSpin], int]:
     """Получить историю спинов пользователя."""
-    # Общее количество
-    count_result = await db.execute(select(func.count(WheelSpin.id)).where(WheelSpin.user_id == user_id))
-    total = count_result.scalar() or 0
-
-    # Спины с пагинацией (eager load prize relationship)
+    # Страница и общее количество одним запросом (оконный COUNT(*) OVER ())
     result = await db.execute(
-        select(WheelSpin)
+        select(WheelSpin, func.count().over().label('total'))
         .options(selectinload(WheelSpin.prize))
         .where(WheelSpin.user_id == user_id)
         .order_by(desc(WheelSpin.created_at))
         .limit(limit)
         .offset(offset)
     )
-    spins = list(result.scalars().all())
+    rows = result.all()
+    spins = [row[0] for row in rows]
+
+    if rows:
+        total = rows[0][1]
+    elif offset > 0:
+        # Страница за пределами выборки — окно пустое, считаем отдельно
+        count_result = await db.execute(select(func.count(WheelSpin.id)).where(WheelSpin.user_id == user_id))
+        total = count_result.scalar() or 0
+    else:
+        total = 0
 
     return spins, total
 
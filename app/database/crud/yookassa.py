@@ -96,17 +96,16 @@ async def update_yookassa_payment_status(
     if payment_method_type:
         update_data['payment_method_type'] = payment_method_type
 
-    await db.execute(
-        update(YooKassaPayment).where(YooKassaPayment.yookassa_payment_id == yookassa_payment_id).values(**update_data)
-    )
-    await db.commit()
-
+    # UPDATE ... RETURNING вместо UPDATE + повторного SELECT: один запрос на вебхук
     result = await db.execute(
-        select(YooKassaPayment)
-        .options(selectinload(YooKassaPayment.user))
+        update(YooKassaPayment)
         .where(YooKassaPayment.yookassa_payment_id == yookassa_payment_id)
+        .values(**update_data)
+        .returning(YooKassaPayment)
+        .options(selectinload(YooKassaPayment.user))
     )
     payment = result.scalar_one_or_none()
+    await db.commit()
 
     if payment:
         logger.info(
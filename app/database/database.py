@@ -3,8 +3,9 @@ import time
 from collections.abc import AsyncGenerator, Awaitable, Callable
 from contextlib import asynccontextmanager
 from functools import wraps
-from typing import ParamSpec, TypeVar
+from typing import Any, ParamSpec, TypeVar
 
+import orjson
 import structlog
 from sqlalchemy import bindparam, event, text
 from sqlalchemy.engine import Engine
@@ -63,8 +64,18 @@ _pg_connect_args = {
     },
     'command_timeout': 30,  # Уменьшен с 60, быстрее обнаруживать зависшие запросы
     'timeout': 10,  # Уменьшен с 60, быстрый провал при недоступности PostgreSQL
+    # Кеши prepared statements (по умолчанию 100) — запросов в боте заметно больше,
+    # при вытеснении asyncpg заново делает PREPARE на каждом соединении
+    'statement_cache_size': 500,  # asyncpg: серверные prepared statements
+    'prepared_statement_cache_size': 500,  # SQLAlchemy asyncpg-адаптер
 }
 
+
+def _json_serializer(value: Any) -> str:
+    """Сериализация JSON-колонок через orjson (не-строковые ключи приводятся к строкам, как в json.dumps)"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 engine = create_async_engine(
     DATABASE_URL,
     poolclass=poolclass,
@@ -73,6 +84,9 @@ engine = create_async_engine(
     # Кеш скомпилированных запросов (правильное размещение)
     query_cache_size=500,
     connect_args=_pg_connect_args if not IS_SQLITE else {},
+    # metadata_json и прочие JSON-колонки: orjson вместо stdlib json на каждой записи/чтении
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
     execution_options={
         'isolation_level': 'READ COMMITTED',
     },
@@ -230,6 +244,8 @@ class DatabaseManager:
                     pool_pre_ping=True,
                     pool_recycle=3600,
                     echo=False,
+                    json_serializer=_json_serializer,
+                    json_deserializer=orjson.loads,
                 )
                 # Создаём sessionmaker один раз (не при каждом вызове)
                 self._read_replica_session_factory = async_sessionmaker(
@@ -1,3 +1,5 @@
+import functools
+import os
 from datetime import UTC, datetime, time, timedelta
 
 
@@ -32,6 +34,7 @@ from sqlalchemy import (
 )
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Mapped, backref, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -48,6 +51,13 @@ class AwareDateTime(TypeDecorator):
     def __init__(self):
         super().__init__(timezone=True)
 
+    def result_processor(self, dialect, coltype):
+        # На PostgreSQL все колонки — TIMESTAMPTZ (миграция 0007), asyncpg сразу отдаёт
+        # aware datetime, поэтому построчный Python-хук не нужен
+        if dialect.name == 'postgresql':
+            return self.impl_instance.result_processor(dialect, coltype)
+        return super().result_processor(dialect, coltype)
+
     def process_result_value(self, value, dialect):
         if value is not None and isinstance(value, datetime) and value.tzinfo is None:
             return value.replace(tzinfo=UTC)
@@ -56,6 +66,12 @@ class AwareDateTime(TypeDecorator):
 
 Base = declarative_base()
 
+# Стратегия загрузки связей, которые код грузит только явно (selectinload/joinedload): связи платежей,
+# промогруппы серверов, накопительные коллекции пользователя и тикета. В тестах (DB_RAISE_ON_LAZY_LOAD=true)
+# неявная ленивая загрузка падает сразу, чтобы ловить N+1; в проде остаётся обычная ленивая загрузка,
+# чтобы пропущенный загрузчик стоил лишнего запроса, а не InvalidRequestError
+_EXPLICIT_LOAD_LAZY = 'raise_on_sql' if os.getenv('DB_RAISE_ON_LAZY_LOAD', 'false').lower() == 'true' else 'select'
+
 
 server_squad_promo_groups = Table(
     'server_squad_promo_groups',
@@ -193,11 +209,34 @@ class WheelSpinPaymentType(Enum):
     SUBSCRIPTION_DAYS = 'subscription_days'
 
 
+def _purchase_token_index(table_name: str) -> Index:
+    """Частичный индекс по metadata_json ->> 'purchase_token' для поиска гостевых покупок."""
+    return Index(
+        f'ix_{table_name}_purchase_token',
+        text("(metadata_json ->> 'purchase_token')"),
+        postgresql_where=text("metadata_json ->> 'purchase_token' IS NOT NULL"),
+    )
+
+
+def _transaction_id_index(table_name: str) -> Index:
+    """Частичный индекс по transaction_id: у большинства платежей он пуст до зачисления."""
+    return Index(
+        f'ix_{table_name}_transaction_id',
+        'transaction_id',
+        postgresql_where=text('transaction_id IS NOT NULL'),
+    )
+
+
 class YooKassaPayment(Base):
     __tablename__ = 'yookassa_payments'
+    __table_args__ = (
+        _purchase_token_index('yookassa_payments'),
+        Index('ix_yookassa_payments_created_at', 'created_at'),
+        _transaction_id_index('yookassa_payments'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=True)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=True, index=True)
     yookassa_payment_id = Column(String(255), unique=True, nullable=False, index=True)
     amount_kopeks = Column(Integer, nullable=False)
     currency = Column(String(3), default='RUB', nullable=False)
@@ -215,10 +254,10 @@ class YooKassaPayment(Base):
     updated_at = Column(AwareDateTime(), default=func.now(), onupdate=func.now())
     yookassa_created_at = Column(AwareDateTime(), nullable=True)
     captured_at = Column(AwareDateTime(), nullable=True)
-    user = relationship('User', backref='yookassa_payments')
-    transaction = relationship('Transaction', backref='yookassa_payment')
+    user = relationship('User', back_populates='yookassa_payments', lazy=_EXPLICIT_LOAD_LAZY)
+    transaction = relationship('Transaction', back_populates='yookassa_payment', lazy=_EXPLICIT_LOAD_LAZY)
 
-    @property
+    @hybrid_property
     def amount_rubles(self) -> float:
         return self.amount_kopeks / 100
 
@@ -232,7 +271,7 @@ class YooKassaPayment(Base):
 
     @property
     def is_failed(self) -> bool:
-        return self.status in ['canceled', 'failed']
+        return self.status in {'canceled', 'failed'}
 
     @property
     def can_be_captured(self) -> bool:
@@ -276,9 +315,13 @@ class SavedPaymentMethod(Base):
 
 class CryptoBotPayment(Base):
     __tablename__ = 'cryptobot_payments'
+    __table_args__ = (
+        Index('ix_cryptobot_payments_created_at', 'created_at'),
+        _transaction_id_index('cryptobot_payments'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=True)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=True, index=True)
 
     invoice_id = Column(String(255), unique=True, nullable=False, index=True)
     amount = Column(String(50), nullable=False)
@@ -298,8 +341,8 @@ class CryptoBotPayment(Base):
     created_at = Column(AwareDateTime(), default=func.now())
     updated_at = Column(AwareDateTime(), default=func.now(), onupdate=func.now())
 
-    user = relationship('User', backref='cryptobot_payments')
-    transaction = relationship('Transaction', backref='cryptobot_payment')
+    user = relationship('User', back_populates='cryptobot_payments', lazy=_EXPLICIT_LOAD_LAZY)
+    transaction = relationship('Transaction', back_populates='cryptobot_payment', lazy=_EXPLICIT_LOAD_LAZY)
 
     @property
     def amount_float(self) -> float:
@@ -326,9 +369,14 @@ class CryptoBotPayment(Base):
 
 class HeleketPayment(Base):
     __tablename__ = 'heleket_payments'
+    __table_args__ = (
+        _purchase_token_index('heleket_payments'),
+        Index('ix_heleket_payments_created_at', 'created_at'),
+        _transaction_id_index('heleket_payments'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=True)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=True, index=True)
 
     uuid = Column(String(255), unique=True, nullable=False, index=True)
     order_id = Column(String(128), unique=True, nullable=False, index=True)
@@ -351,8 +399,8 @@ class HeleketPayment(Base):
     created_at = Column(AwareDateTime(), default=func.now())
     updated_at = Column(AwareDateTime(), default=func.now(), onupdate=func.now())
 
-    user = relationship('User', backref='heleket_payments')
-    transaction = relationship('Transaction', backref='heleket_payment')
+    user = relationship('User', back_populates='heleket_payments', lazy=_EXPLICIT_LOAD_LAZY)
+    transaction = relationship('Transaction', back_populates='heleket_payment', lazy=_EXPLICIT_LOAD_LAZY)
 
     @property
     def amount_float(self) -> float:
@@ -385,9 +433,14 @@ class HeleketPayment(Base):
 
 class MulenPayPayment(Base):
     __tablename__ = 'mulenpay_payments'
+    __table_args__ = (
+        _purchase_token_index('mulenpay_payments'),
+        Index('ix_mulenpay_payments_created_at', 'created_at'),
+        _transaction_id_index('mulenpay_payments'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=True)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=True, index=True)
 
     mulen_payment_id = Column(Integer, nullable=True, index=True)
     uuid = Column(String(255), unique=True, nullable=False, index=True)
@@ -408,10 +461,10 @@ class MulenPayPayment(Base):
     created_at = Column(AwareDateTime(), default=func.now())
     updated_at = Column(AwareDateTime(), default=func.now(), onupdate=func.now())
 
-    user = relationship('User', backref='mulenpay_payments')
-    transaction = relationship('Transaction', backref='mulenpay_payment')
+    user = relationship('User', back_populates='mulenpay_payments', lazy=_EXPLICIT_LOAD_LAZY)
+    transaction = relationship('Transaction', back_populates='mulenpay_payment', lazy=_EXPLICIT_LOAD_LAZY)
 
-    @property
+    @hybrid_property
     def amount_rubles(self) -> float:
         return self.amount_kopeks / 100
 
@@ -421,9 +474,14 @@ class MulenPayPayment(Base):
 
 class Pal24Payment(Base):
     __tablename__ = 'pal24_payments'
+    __table_args__ = (
+        _purchase_token_index('pal24_payments'),
+        Index('ix_pal24_payments_created_at', 'created_at'),
+        _transaction_id_index('pal24_payments'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=True)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=True, index=True)
 
     bill_id = Column(String(255), unique=True, nullable=False, index=True)
     order_id = Column(String(255), nullable=True, index=True)
@@ -459,10 +517,10 @@ class Pal24Payment(Base):
     created_at = Column(AwareDateTime(), default=func.now())
     updated_at = Column(AwareDateTime(), default=func.now(), onupdate=func.now())
 
-    user = relationship('User', backref='pal24_payments')
-    transaction = relationship('Transaction', backref='pal24_payment')
+    user = relationship('User', back_populates='pal24_payments', lazy=_EXPLICIT_LOAD_LAZY)
+    transaction = relationship('Transaction', back_populates='pal24_payment', lazy=_EXPLICIT_LOAD_LAZY)
 
-    @property
+    @hybrid_property
     def amount_rubles(self) -> float:
         return self.amount_kopeks / 100
 
@@ -478,9 +536,14 @@ class Pal24Payment(Base):
 
 class WataPayment(Base):
     __tablename__ = 'wata_payments'
+    __table_args__ = (
+        _purchase_token_index('wata_payments'),
+        Index('ix_wata_payments_created_at', 'created_at'),
+        _transaction_id_index('wata_payments'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=True)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=True, index=True)
 
     payment_link_id = Column(String(64), unique=True, nullable=False, index=True)
     order_id = Column(String(255), nullable=True, index=True)
@@ -508,10 +571,10 @@ class WataPayment(Base):
     created_at = Column(AwareDateTime(), default=func.now())
     updated_at = Column(AwareDateTime(), default=func.now(), onupdate=func.now())
 
-    user = relationship('User', backref='wata_payments')
-    transaction = relationship('Transaction', backref='wata_payment')
+    user = relationship('User', back_populates='wata_payments', lazy=_EXPLICIT_LOAD_LAZY)
+    transaction = relationship('Transaction', back_populates='wata_payment', lazy=_EXPLICIT_LOAD_LAZY)
 
-    @property
+    @hybrid_property
     def amount_rubles(self) -> float:
         return self.amount_kopeks / 100
 
@@ -521,9 +584,14 @@ class WataPayment(Base):
 
 class PlategaPayment(Base):
     __tablename__ = 'platega_payments'
+    __table_args__ = (
+        _purchase_token_index('platega_payments'),
+        Index('ix_platega_payments_created_at', 'created_at'),
+        _transaction_id_index('platega_payments'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=True)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=True, index=True)
 
     platega_transaction_id = Column(String(255), unique=True, nullable=True, index=True)
     correlation_id = Column(String(64), unique=True, nullable=False, index=True)
@@ -550,10 +618,10 @@ class PlategaPayment(Base):
     created_at = Column(AwareDateTime(), default=func.now())
     updated_at = Column(AwareDateTime(), default=func.now(), onupdate=func.now())
 
-    user = relationship('User', backref='platega_payments')
-    transaction = relationship('Transaction', backref='platega_payment')
+    user = relationship('User', back_populates='platega_payments', lazy=_EXPLICIT_LOAD_LAZY)
+    transaction = relationship('Transaction', back_populates='platega_payment', lazy=_EXPLICIT_LOAD_LAZY)
 
-    @property
+    @hybrid_property
     def amount_rubles(self) -> float:
         return self.amount_kopeks / 100
 
@@ -563,9 +631,14 @@ class PlategaPayment(Base):
 
 class CloudPaymentsPayment(Base):
     __tablename__ = 'cloudpayments_payments'
+    __table_args__ = (
+        _purchase_token_index('cloudpayments_payments'),
+        Index('ix_cloudpayments_payments_created_at', 'created_at'),
+        _transaction_id_index('cloudpayments_payments'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=True)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=True, index=True)
 
     # CloudPayments идентификаторы
     transaction_id_cp = Column(BigInteger, unique=True, nullable=True, index=True)  # TransactionId от CloudPayments
@@ -607,10 +680,10 @@ class CloudPaymentsPayment(Base):
     created_at = Column(AwareDateTime(), default=func.now())
     updated_at = Column(AwareDateTime(), default=func.now(), onupdate=func.now())
 
-    user = relationship('User', backref='cloudpayments_payments')
-    transaction = relationship('Transaction', backref='cloudpayments_payment')
+    user = relationship('User', back_populates='cloudpayments_payments', lazy=_EXPLICIT_LOAD_LAZY)
+    transaction = relationship('Transaction', back_populates='cloudpayments_payment', lazy=_EXPLICIT_LOAD_LAZY)
 
-    @property
+    @hybrid_property
     def amount_rubles(self) -> float:
         return self.amount_kopeks / 100
 
@@ -632,9 +705,14 @@ class CloudPaymentsPayment(Base):
 
 class FreekassaPayment(Base):
     __tablename__ = 'freekassa_payments'
+    __table_args__ = (
+        _purchase_token_index('freekassa_payments'),
+        Index('ix_freekassa_payments_created_at', 'created_at'),
+        _transaction_id_index('freekassa_payments'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=True)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=True, index=True)
 
     # Идентификаторы
     order_id = Column(String(64), unique=True, nullable=False, index=True)  # Наш ID заказа
@@ -667,10 +745,10 @@ class FreekassaPayment(Base):
     transaction_id = Column(Integer, ForeignKey('transactions.id'), nullable=True)
 
     # Relationships
-    user = relationship('User', backref='freekassa_payments')
-    transaction = relationship('Transaction', backref='freekassa_payment')
+    user = relationship('User', back_populates='freekassa_payments', lazy=_EXPLICIT_LOAD_LAZY)
+    transaction = relationship('Transaction', back_populates='freekassa_payment', lazy=_EXPLICIT_LOAD_LAZY)
 
-    @property
+    @hybrid_property
     def amount_rubles(self) -> float:
         return self.amount_kopeks / 100
 
@@ -684,7 +762,7 @@ class FreekassaPayment(Base):
 
     @property
     def is_failed(self) -> bool:
-        return self.status in ['failed', 'expired']
+        return self.status in {'failed', 'expired'}
 
     def __repr__(self) -> str:  # pragma: no cover - debug helper
         return f'<FreekassaPayment(id={self.id}, order_id={self.order_id}, amount={self.amount_rubles}₽, status={self.status})>'
@@ -694,9 +772,14 @@ class KassaAiPayment(Base):
     """Платежи через KassaAI (api.fk.life)."""
 
     __tablename__ = 'kassa_ai_payments'
+    __table_args__ = (
+        _purchase_token_index('kassa_ai_payments'),
+        Index('ix_kassa_ai_payments_created_at', 'created_at'),
+        _transaction_id_index('kassa_ai_payments'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=True)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=True, index=True)
 
     # Идентификаторы
     order_id = Column(String(64), unique=True, nullable=False, index=True)  # Наш ID заказа
@@ -729,10 +812,10 @@ class KassaAiPayment(Base):
     transaction_id = Column(Integer, ForeignKey('transactions.id'), nullable=True)
 
     # Relationships
-    user = relationship('User', backref='kassa_ai_payments')
-    transaction = relationship('Transaction', backref='kassa_ai_payment')
+    user = relationship('User', back_populates='kassa_ai_payments', lazy=_EXPLICIT_LOAD_LAZY)
+    transaction = relationship('Transaction', back_populates='kassa_ai_payment', lazy=_EXPLICIT_LOAD_LAZY)
 
-    @property
+    @hybrid_property
     def amount_rubles(self) -> float:
         return self.amount_kopeks / 100
 
@@ -746,7 +829,7 @@ class KassaAiPayment(Base):
 
     @property
     def is_failed(self) -> bool:
-        return self.status in ['failed', 'expired']
+        return self.status in {'failed', 'expired'}
 
     def __repr__(self) -> str:  # pragma: no cover - debug helper
         return f'<KassaAiPayment(id={self.id}, order_id={self.order_id}, amount={self.amount_rubles}₽, status={self.status})>'
@@ -756,6 +839,11 @@ class RioPayPayment(Base):
     """Платежи через RioPay (api.riopay.online)."""
 
     __tablename__ = 'riopay_payments'
+    __table_args__ = (
+        _purchase_token_index('riopay_payments'),
+        Index('ix_riopay_payments_created_at', 'created_at'),
+        _transaction_id_index('riopay_payments'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey('users.id', ondelete='SET NULL'), nullable=True, index=True)
@@ -791,10 +879,10 @@ class RioPayPayment(Base):
     transaction_id = Column(Integer, ForeignKey('transactions.id'), nullable=True)
 
     # Relationships
-    user = relationship('User', backref='riopay_payments')
-    transaction = relationship('Transaction', backref='riopay_payment')
+    user = relationship('User', back_populates='riopay_payments', lazy=_EXPLICIT_LOAD_LAZY)
+    transaction = relationship('Transaction', back_populates='riopay_payment', lazy=_EXPLICIT_LOAD_LAZY)
 
-    @property
+    @hybrid_property
     def amount_rubles(self) -> float:
         return self.amount_kopeks / 100
 
@@ -808,7 +896,7 @@ class RioPayPayment(Base):
 
     @property
     def is_failed(self) -> bool:
-        return self.status in ['failed', 'expired', 'canceled']
+        return self.status in {'failed', 'expired', 'canceled'}
 
     def __repr__(self) -> str:  # pragma: no cover - debug helper
         return f'<RioPayPayment(id={self.id}, order_id={self.order_id}, amount={self.amount_rubles}₽, status={self.status})>'
@@ -818,6 +906,11 @@ class SeverPayPayment(Base):
     """Платежи через SeverPay (severpay.io)."""
 
     __tablename__ = 'severpay_payments'
+    __table_args__ = (
+        _purchase_token_index('severpay_payments'),
+        Index('ix_severpay_payments_created_at', 'created_at'),
+        _transaction_id_index('severpay_payments'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey('users.id', ondelete='SET NULL'), nullable=True, index=True)
@@ -854,10 +947,10 @@ class SeverPayPayment(Base):
     transaction_id = Column(Integer, ForeignKey('transactions.id'), nullable=True)
 
     # Relationships
-    user = relationship('User', backref='severpay_payments')
-    transaction = relationship('Transaction', backref='severpay_payment')
+    user = relationship('User', back_populates='severpay_payments', lazy=_EXPLICIT_LOAD_LAZY)
+    transaction = relationship('Transaction', back_populates='severpay_payment', lazy=_EXPLICIT_LOAD_LAZY)
 
-    @property
+    @hybrid_property
     def amount_rubles(self) -> float:
         return self.amount_kopeks / 100
 
@@ -871,12 +964,20 @@ class SeverPayPayment(Base):
 
     @property
     def is_failed(self) -> bool:
-        return self.status in ['failed', 'expired', 'declined', 'amount_mismatch']
+        return self.status in {'failed', 'expired', 'declined', 'amount_mismatch'}
 
     def __repr__(self) -> str:  # pragma: no cover - debug helper
         return f'<SeverPayPayment(id={self.id}, order_id={self.order_id}, amount={self.amount_rubles}₽, status={self.status})>'
 
 
+@functools.cache
+def _get_settings():
+    """Lazy app.config.settings import (models must not import config at module load)."""
+    from app.config import settings
+
+    return settings
+
+
 class PromoGroup(Base):
     __tablename__ = 'promo_groups'
 
@@ -903,7 +1004,13 @@ class PromoGroup(Base):
     )
 
     def _get_period_discounts_map(self) -> dict[int, int]:
-        raw_discounts = self.period_discounts or {}
+        raw_discounts = self.period_discounts
+
+        # Нормализованная карта кешируется до переприсваивания period_discounts
+        # (JSON-колонка не отслеживает изменения на месте, код всегда присваивает новый dict)
+        cached = self.__dict__.get('_period_discounts_cache')
+        if cached is not None and cached[0] is raw_discounts:
+            return cached[1]
 
         if isinstance(raw_discounts, dict):
             items = raw_discounts.items()
@@ -921,6 +1028,7 @@ class PromoGroup(Base):
 
             normalized[period] = max(0, min(100, percent))
 
+        self._period_discounts_cache = (raw_discounts, normalized)
         return normalized
 
     def _get_period_discount(self, period_days: int | None) -> int:
@@ -934,8 +1042,7 @@ class PromoGroup(Base):
 
         if self.is_default:
             try:
-                from app.config import settings
-
+                settings = _get_settings()
                 if settings.is_base_promo_group_period_discount_enabled():
                     config_discounts = settings.get_base_promo_group_period_discounts()
                     return config_discounts.get(period_days, 0)
@@ -1069,13 +1176,15 @@ class Tariff(Base):
 
     def get_price_for_period(self, period_days: int) -> int | None:
         """Возвращает цену в копейках для указанного периода."""
-        prices = self.period_prices or {}
-        return prices.get(str(period_days))
+        prices = self.period_prices
+        return prices.get(str(period_days)) if prices else None
 
     def get_available_periods(self) -> list[int]:
         """Возвращает список доступных периодов в днях."""
-        prices = self.period_prices or {}
-        return sorted([int(p) for p in prices.keys()])
+        prices = self.period_prices
+        if not prices:
+            return []
+        return sorted([int(p) for p in prices])
 
     def get_shortest_period(self) -> int | None:
         """Возвращает минимальный доступный период в днях (для автопродления)."""
@@ -1095,13 +1204,12 @@ class Tariff(Base):
         Если для сервера настроен отдельный лимит - возвращает его,
         иначе возвращает общий traffic_limit_gb тарифа.
         """
-        limits = self.server_traffic_limits or {}
-        if squad_uuid in limits:
-            server_limit = limits[squad_uuid]
-            if isinstance(server_limit, dict) and 'traffic_limit_gb' in server_limit:
-                return server_limit['traffic_limit_gb']
-            if isinstance(server_limit, int):
-                return server_limit
+        limits = self.server_traffic_limits
+        server_limit = limits.get(squad_uuid) if limits else None
+        if isinstance(server_limit, dict) and 'traffic_limit_gb' in server_limit:
+            return server_limit['traffic_limit_gb']
+        if isinstance(server_limit, int):
+            return server_limit
         return self.traffic_limit_gb
 
     def is_available_for_promo_group(self, promo_group_id: int | None) -> bool:
@@ -1114,7 +1222,9 @@ class Tariff(Base):
 
     def get_traffic_topup_packages(self) -> dict[int, int]:
         """Возвращает пакеты трафика для докупки: {ГБ: цена в копейках}."""
-        packages = self.traffic_topup_packages or {}
+        packages = self.traffic_topup_packages
+        if not packages:
+            return {}
         return {int(gb): int(price) for gb, price in packages.items()}
 
     def get_traffic_topup_price(self, gb: int) -> int | None:
@@ -1174,6 +1284,7 @@ class PartnerStatus(Enum):
 
 class User(Base):
     __tablename__ = 'users'
+    __table_args__ = (Index('ix_users_username_lower', text('lower(username)')),)
 
     id = Column(Integer, primary_key=True, index=True)
     telegram_id = Column(BigInteger, unique=True, index=True, nullable=True)  # Nullable для email-only пользователей
@@ -1238,6 +1349,30 @@ class User(Base):
     user_promo_groups = relationship('UserPromoGroup', back_populates='user', cascade='all, delete-orphan')
     poll_responses = relationship('PollResponse', back_populates='user')
     admin_roles_rel = relationship('UserRole', foreign_keys='[UserRole.user_id]', back_populates='user')
+    yookassa_payments = relationship('YooKassaPayment', back_populates='user')
+    cryptobot_payments = relationship('CryptoBotPayment', back_populates='user')
+    heleket_payments = relationship('HeleketPayment', back_populates='user')
+    mulenpay_payments = relationship('MulenPayPayment', back_populates='user')
+    pal24_payments = relationship('Pal24Payment', back_populates='user')
+    wata_payments = relationship('WataPayment', back_populates='user')
+    platega_payments = relationship('PlategaPayment', back_populates='user')
+    cloudpayments_payments = relationship('CloudPaymentsPayment', back_populates='user')
+    freekassa_payments = relationship('FreekassaPayment', back_populates='user')
+    kassa_ai_payments = relationship('KassaAiPayment', back_populates='user')
+    riopay_payments = relationship('RioPayPayment', back_populates='user')
+    severpay_payments = relationship('SeverPayPayment', back_populates='user')
+    # Накопительные коллекции: не читаются с этой стороны, строки удаляет/обнуляет ON DELETE в БД
+    tickets = relationship('Ticket', back_populates='user', lazy=_EXPLICIT_LOAD_LAZY, passive_deletes=True)
+    created_messages = relationship(
+        'UserMessage', back_populates='creator', lazy=_EXPLICIT_LOAD_LAZY, passive_deletes=True
+    )
+    wheel_spins = relationship('WheelSpin', back_populates='user', lazy=_EXPLICIT_LOAD_LAZY, passive_deletes=True)
+    cabinet_tokens = relationship(
+        'CabinetRefreshToken', back_populates='user', lazy=_EXPLICIT_LOAD_LAZY, passive_deletes=True
+    )
+    ticket_notifications = relationship(
+        'TicketNotification', back_populates='user', lazy=_EXPLICIT_LOAD_LAZY, passive_deletes=True
+    )
     notification_settings = Column(JSON, nullable=True, default=dict)
     last_pinned_message_id = Column(Integer, nullable=True)
 
@@ -1294,16 +1429,15 @@ class User(Base):
             if not self.user_promo_groups:
                 return getattr(self, 'promo_group', None)
 
-            # Сортируем по приоритету группы (убывание), затем по ID группы
+            # Максимум по приоритету группы, затем по ID группы (полная сортировка не нужна)
             # Используем getattr для защиты от ленивой загрузки
-            sorted_groups = sorted(
+            top_group = max(
                 self.user_promo_groups,
                 key=lambda upg: (getattr(upg.promo_group, 'priority', 0) if upg.promo_group else 0, upg.promo_group_id),
-                reverse=True,
             )
 
-            if sorted_groups and sorted_groups[0].promo_group:
-                return sorted_groups[0].promo_group
+            if top_group.promo_group:
+                return top_group.promo_group
         except Exception:
             # Если возникла ошибка (например, ленивая загрузка в async), fallback на старую связь
             pass
@@ -1327,11 +1461,31 @@ class User(Base):
         return False
 
 
+# Отображение фактического статуса подписки (active + is_trial обрабатывается отдельно)
+_SUBSCRIPTION_STATUS_DISPLAY = {
+    'expired': '🔴 Истекла',
+    'active': '🟢 Активна',
+    'disabled': '⚫ Отключена',
+    'limited': '⚠️ Трафик исчерпан',
+    'trial': '🎯 Тестовая',
+}
+
+_SUBSCRIPTION_STATUS_EMOJI = {
+    'expired': '🔴',
+    'active': '💎',
+    'disabled': '⚫',
+    'limited': '⚠️',
+    'trial': '🎁',
+}
+
+
 class Subscription(Base):
     __tablename__ = 'subscriptions'
     __table_args__ = (
         Index('ix_subscriptions_status_trial', 'status', 'is_trial'),
         Index('ix_subscriptions_trial_created', 'is_trial', 'created_at'),
+        # Фоновые проверки истечения: status = 'active' AND end_date <= / между порогами
+        Index('ix_subscriptions_active_end_date', 'end_date', postgresql_where=text("status = 'active'")),
     )
 
     id = Column(Integer, primary_key=True, index=True)
@@ -1386,6 +1540,7 @@ class Subscription(Base):
     traffic_purchases = relationship(
         'TrafficPurchase', back_populates='subscription', passive_deletes=True, cascade='all, delete-orphan'
     )
+    subscription_servers = relationship('SubscriptionServer', back_populates='subscription', passive_deletes=True)
 
     @property
     def is_active(self) -> bool:
@@ -1407,67 +1562,39 @@ class Subscription(Base):
 
     @property
     def actual_status(self) -> str:
-        current_time = datetime.now(UTC)
-        end = _aware(self.end_date)
+        status = self.status
 
-        if self.status == SubscriptionStatus.EXPIRED.value:
+        if status == SubscriptionStatus.EXPIRED.value:
             return 'expired'
 
-        if self.status == SubscriptionStatus.DISABLED.value:
+        if status == SubscriptionStatus.DISABLED.value:
             return 'disabled'
 
-        if self.status == SubscriptionStatus.LIMITED.value:
+        if status == SubscriptionStatus.LIMITED.value:
             return 'limited'
 
-        if self.status == SubscriptionStatus.ACTIVE.value:
-            if end is None or end <= current_time:
+        if status in {SubscriptionStatus.ACTIVE.value, SubscriptionStatus.TRIAL.value}:
+            # Текущее время нужно только для статусов, зависящих от end_date
+            end = _aware(self.end_date)
+            if end is None or end <= datetime.now(UTC):
                 return 'expired'
-            return 'active'
+            return 'active' if status == SubscriptionStatus.ACTIVE.value else 'trial'
 
-        if self.status == SubscriptionStatus.TRIAL.value:
-            if end is None or end <= current_time:
-                return 'expired'
-            return 'trial'
-
-        return self.status
+        return status
 
     @property
     def status_display(self) -> str:
         actual_status = self.actual_status
-
-        if actual_status == 'expired':
-            return '🔴 Истекла'
-        if actual_status == 'active':
-            if self.is_trial:
-                return '🎯 Тестовая'
-            return '🟢 Активна'
-        if actual_status == 'disabled':
-            return '⚫ Отключена'
-        if actual_status == 'limited':
-            return '⚠️ Трафик исчерпан'
-        if actual_status == 'trial':
+        if actual_status == 'active' and self.is_trial:
             return '🎯 Тестовая'
-
-        return '❓ Неизвестно'
+        return _SUBSCRIPTION_STATUS_DISPLAY.get(actual_status, '❓ Неизвестно')
 
     @property
     def status_emoji(self) -> str:
         actual_status = self.actual_status
-
-        if actual_status == 'expired':
-            return '🔴'
-        if actual_status == 'active':
-            if self.is_trial:
-                return '🎁'
-            return '💎'
-        if actual_status == 'disabled':
-            return '⚫'
-        if actual_status == 'limited':
-            return '⚠️'
-        if actual_status == 'trial':
+        if actual_status == 'active' and self.is_trial:
             return '🎁'
-
-        return '❓'
+        return _SUBSCRIPTION_STATUS_EMOJI.get(actual_status, '❓')
 
     @property
     def days_left(self) -> int:
@@ -1598,8 +1725,20 @@ class Transaction(Base):
     completed_at = Column(AwareDateTime(), nullable=True)
 
     user = relationship('User', back_populates='transactions')
-
-    @property
+    yookassa_payment = relationship('YooKassaPayment', back_populates='transaction')
+    cryptobot_payment = relationship('CryptoBotPayment', back_populates='transaction')
+    heleket_payment = relationship('HeleketPayment', back_populates='transaction')
+    mulenpay_payment = relationship('MulenPayPayment', back_populates='transaction')
+    pal24_payment = relationship('Pal24Payment', back_populates='transaction')
+    wata_payment = relationship('WataPayment', back_populates='transaction')
+    platega_payment = relationship('PlategaPayment', back_populates='transaction')
+    cloudpayments_payment = relationship('CloudPaymentsPayment', back_populates='transaction')
+    freekassa_payment = relationship('FreekassaPayment', back_populates='transaction')
+    kassa_ai_payment = relationship('KassaAiPayment', back_populates='transaction')
+    riopay_payment = relationship('RioPayPayment', back_populates='transaction')
+    severpay_payment = relationship('SeverPayPayment', back_populates='transaction')
+
+    @hybrid_property
     def amount_rubles(self) -> float:
         return self.amount_kopeks / 100
 
@@ -1696,6 +1835,7 @@ class PromoCodeUse(Base):
 
 class ReferralEarning(Base):
     __tablename__ = 'referral_earnings'
+    __table_args__ = (Index('ix_referral_earnings_user_created', 'user_id', 'created_at'),)
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
@@ -1716,7 +1856,7 @@ class ReferralEarning(Base):
     referral_transaction = relationship('Transaction')
     campaign = relationship('AdvertisingCampaign')
 
-    @property
+    @hybrid_property
     def amount_rubles(self) -> float:
         return self.amount_kopeks / 100
 
@@ -1760,7 +1900,7 @@ class WithdrawalRequest(Base):
     user = relationship('User', foreign_keys=[user_id], backref='withdrawal_requests')
     admin = relationship('User', foreign_keys=[processed_by])
 
-    @property
+    @hybrid_property
     def amount_rubles(self) -> float:
         return self.amount_kopeks / 100
 
@@ -1863,7 +2003,8 @@ class ReferralContestVirtualParticipant(Base):
     contest_id = Column(Integer, ForeignKey('referral_contests.id', ondelete='CASCADE'), nullable=False)
     display_name = Column(String(255), nullable=False)
     referral_count = Column(Integer, nullable=False, default=0)
-    total_amount_kopeks = Column(Integer, nullable=False, default=0)
+    # Накопленная сумма за весь конкурс: BigInteger, т.к. Integer переполняется на ~21.4 млн ₽
+    total_amount_kopeks = Column(BigInteger, nullable=False, default=0)
     created_at = Column(AwareDateTime(), default=func.now())
 
     contest = relationship('ReferralContest')
@@ -1923,10 +2064,8 @@ class ContestRound(Base):
 
 class ContestAttempt(Base):
     __tablename__ = 'contest_attempts'
-    __table_args__ = (
-        UniqueConstraint('round_id', 'user_id', name='uq_round_user_attempt'),
-        Index('idx_contest_attempt_round', 'round_id'),
-    )
+    # Уникальный индекс (round_id, user_id) обслуживает и выборки по round_id
+    __table_args__ = (UniqueConstraint('round_id', 'user_id', name='uq_round_user_attempt'),)
 
     id = Column(Integer, primary_key=True, index=True)
     round_id = Column(Integer, ForeignKey('contest_rounds.id', ondelete='CASCADE'), nullable=False)
@@ -2072,6 +2211,7 @@ class MonitoringLog(Base):
 
 class SentNotification(Base):
     __tablename__ = 'sent_notifications'
+    __table_args__ = (Index('ix_sent_notifications_sub_type', 'subscription_id', 'notification_type'),)
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
@@ -2086,6 +2226,7 @@ class SentNotification(Base):
 
 class SubscriptionEvent(Base):
     __tablename__ = 'subscription_events'
+    __table_args__ = (Index('ix_subscription_events_user_occurred', 'user_id', 'occurred_at'),)
 
     id = Column(Integer, primary_key=True, index=True)
     event_type = Column(String(50), nullable=False)
@@ -2106,7 +2247,10 @@ class SubscriptionEvent(Base):
 
 class DiscountOffer(Base):
     __tablename__ = 'discount_offers'
-    __table_args__ = (Index('ix_discount_offers_user_type', 'user_id', 'notification_type'),)
+    __table_args__ = (
+        Index('ix_discount_offers_user_type', 'user_id', 'notification_type'),
+        Index('ix_discount_offers_active_expires', 'expires_at', postgresql_where=text('is_active = true')),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
@@ -2335,14 +2479,18 @@ class ServerSquad(Base):
     created_at = Column(AwareDateTime(), default=func.now())
     updated_at = Column(AwareDateTime(), default=func.now(), onupdate=func.now())
 
+    # Промогруппы нужны только карточке сервера и проверке цены: грузятся явно через selectinload
     allowed_promo_groups = relationship(
         'PromoGroup',
         secondary=server_squad_promo_groups,
         back_populates='server_squads',
-        lazy='selectin',
+        lazy=_EXPLICIT_LOAD_LAZY,
+    )
+    subscription_servers = relationship(
+        'SubscriptionServer', back_populates='server_squad', lazy=_EXPLICIT_LOAD_LAZY, passive_deletes=True
     )
 
-    @property
+    @hybrid_property
     def price_rubles(self) -> float:
         return self.price_kopeks / 100
 
@@ -2366,26 +2514,26 @@ class SubscriptionServer(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     subscription_id = Column(Integer, ForeignKey('subscriptions.id', ondelete='CASCADE'), nullable=False, index=True)
-    server_squad_id = Column(Integer, ForeignKey('server_squads.id'), nullable=False)
+    server_squad_id = Column(Integer, ForeignKey('server_squads.id'), nullable=False, index=True)
 
     connected_at = Column(AwareDateTime(), default=func.now())
 
     paid_price_kopeks = Column(Integer, default=0)
 
-    subscription = relationship('Subscription', backref=backref('subscription_servers', passive_deletes=True))
-    server_squad = relationship('ServerSquad', backref='subscription_servers')
+    subscription = relationship('Subscription', back_populates='subscription_servers')
+    server_squad = relationship('ServerSquad', back_populates='subscription_servers')
 
 
 class SupportAuditLog(Base):
     __tablename__ = 'support_audit_logs'
 
     id = Column(Integer, primary_key=True, index=True)
-    actor_user_id = Column(Integer, ForeignKey('users.id', ondelete='SET NULL'), nullable=True)
+    actor_user_id = Column(Integer, ForeignKey('users.id', ondelete='SET NULL'), nullable=True, index=True)
     actor_telegram_id = Column(BigInteger, nullable=True)  # Can be None for email-only users
     is_moderator = Column(Boolean, default=False)
     action = Column(String(50), nullable=False)  # close_ticket, block_user_timed, block_user_perm, unblock_user
-    ticket_id = Column(Integer, ForeignKey('tickets.id', ondelete='SET NULL'), nullable=True)
-    target_user_id = Column(Integer, ForeignKey('users.id', ondelete='SET NULL'), nullable=True)
+    ticket_id = Column(Integer, ForeignKey('tickets.id', ondelete='SET NULL'), nullable=True, index=True)
+    target_user_id = Column(Integer, ForeignKey('users.id', ondelete='SET NULL'), nullable=True, index=True)
     details = Column(JSON, nullable=True)
     created_at = Column(AwareDateTime(), default=func.now())
 
@@ -2402,7 +2550,7 @@ class UserMessage(Base):
     created_by = Column(Integer, ForeignKey('users.id', ondelete='SET NULL'), nullable=True)
     created_at = Column(AwareDateTime(), default=func.now())
     updated_at = Column(AwareDateTime(), default=func.now(), onupdate=func.now())
-    creator = relationship('User', backref='created_messages')
+    creator = relationship('User', back_populates='created_messages')
 
     def __repr__(self):
         return f"<UserMessage(id={self.id}, active={self.is_active}, text='{self.message_text[:50]}...')>"
@@ -2515,10 +2663,15 @@ class AdvertisingCampaignRegistration(Base):
     user = relationship('User')
     tariff = relationship('Tariff')
 
-    @property
+    @hybrid_property
     def balance_bonus_rubles(self) -> float:
         return (self.balance_bonus_kopeks or 0) / 100
 
+    @balance_bonus_rubles.inplace.expression
+    @classmethod
+    def _balance_bonus_rubles_expression(cls):
+        return func.coalesce(cls.balance_bonus_kopeks, 0) / 100
+
 
 class TicketStatus(Enum):
     OPEN = 'open'
@@ -2527,11 +2680,25 @@ class TicketStatus(Enum):
     PENDING = 'pending'
 
 
+_TICKET_STATUS_EMOJI = {
+    TicketStatus.OPEN.value: '🔴',
+    TicketStatus.ANSWERED.value: '🟡',
+    TicketStatus.CLOSED.value: '🟢',
+    TicketStatus.PENDING.value: '⏳',
+}
+
+_TICKET_PRIORITY_EMOJI = {'low': '🟢', 'normal': '🟡', 'high': '🟠', 'urgent': '🔴'}
+
+
 class Ticket(Base):
     __tablename__ = 'tickets'
+    __table_args__ = (
+        # Очереди поддержки смотрят только незакрытые тикеты, закрытые составляют основную часть таблицы
+        Index('ix_tickets_open_updated', 'status', 'updated_at', postgresql_where=text("status <> 'closed'")),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
 
     title = Column(String(255), nullable=False)
     status = Column(String(20), default=TicketStatus.OPEN.value, nullable=False)
@@ -2545,10 +2712,16 @@ class Ticket(Base):
     closed_at = Column(AwareDateTime(), nullable=True)
     # SLA reminders
     last_sla_reminder_at = Column(AwareDateTime(), nullable=True)
+    # Статистика переписки: ведёт TicketMessageCRUD.insert_message / recalculate_ticket_stats
+    message_count = Column(Integer, default=0, server_default='0', nullable=False)
+    last_message_at = Column(AwareDateTime(), nullable=True)
 
     # Связи
-    user = relationship('User', backref='tickets')
+    user = relationship('User', back_populates='tickets')
     messages = relationship('TicketMessage', back_populates='ticket', cascade='all, delete-orphan')
+    notifications = relationship(
+        'TicketNotification', back_populates='ticket', lazy=_EXPLICIT_LOAD_LAZY, passive_deletes=True
+    )
 
     @property
     def is_open(self) -> bool:
@@ -2576,18 +2749,11 @@ class Ticket(Base):
 
     @property
     def status_emoji(self) -> str:
-        status_emojis = {
-            TicketStatus.OPEN.value: '🔴',
-            TicketStatus.ANSWERED.value: '🟡',
-            TicketStatus.CLOSED.value: '🟢',
-            TicketStatus.PENDING.value: '⏳',
-        }
-        return status_emojis.get(self.status, '❓')
+        return _TICKET_STATUS_EMOJI.get(self.status, '❓')
 
     @property
     def priority_emoji(self) -> str:
-        priority_emojis = {'low': '🟢', 'normal': '🟡', 'high': '🟠', 'urgent': '🔴'}
-        return priority_emojis.get(self.priority, '🟡')
+        return _TICKET_PRIORITY_EMOJI.get(self.priority, '🟡')
 
     def __repr__(self):
         return f"<Ticket(id={self.id}, user_id={self.user_id}, status={self.status}, title='{self.title[:30]}...')>"
@@ -2595,10 +2761,11 @@ class Ticket(Base):
 
 class TicketMessage(Base):
     __tablename__ = 'ticket_messages'
+    __table_args__ = (Index('ix_ticket_messages_ticket_created', 'ticket_id', 'created_at'),)
 
     id = Column(Integer, primary_key=True, index=True)
     ticket_id = Column(Integer, ForeignKey('tickets.id', ondelete='CASCADE'), nullable=False)
-    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
 
     message_text = Column(Text, nullable=False)
     is_from_admin = Column(Boolean, default=False, nullable=False)
@@ -2800,7 +2967,7 @@ class CabinetRefreshToken(Base):
     created_at = Column(AwareDateTime(), default=func.now())
     revoked_at = Column(AwareDateTime(), nullable=True)
 
-    user = relationship('User', backref='cabinet_tokens')
+    user = relationship('User', back_populates='cabinet_tokens')
 
     @property
     def is_expired(self) -> bool:
@@ -2907,7 +3074,7 @@ class WheelSpin(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
-    prize_id = Column(Integer, ForeignKey('wheel_prizes.id', ondelete='SET NULL'), nullable=True)
+    prize_id = Column(Integer, ForeignKey('wheel_prizes.id', ondelete='SET NULL'), nullable=True, index=True)
 
     # Способ оплаты
     payment_type = Column(String(50), nullable=False)  # WheelSpinPaymentType
@@ -2929,16 +3096,16 @@ class WheelSpin(Base):
 
     created_at = Column(AwareDateTime(), default=func.now())
 
-    user = relationship('User', backref='wheel_spins')
+    user = relationship('User', back_populates='wheel_spins')
     prize = relationship('WheelPrize', back_populates='spins')
     generated_promocode = relationship('PromoCode')
 
-    @property
+    @hybrid_property
     def prize_value_rubles(self) -> float:
         """Стоимость приза в рублях."""
         return self.prize_value_kopeks / 100
 
-    @property
+    @hybrid_property
     def payment_value_rubles(self) -> float:
         """Стоимость оплаты в рублях."""
         return self.payment_value_kopeks / 100
@@ -2954,6 +3121,7 @@ class TicketNotification(Base):
     __table_args__ = (
         Index('ix_ticket_notifications_user_read', 'user_id', 'is_read'),
         Index('ix_ticket_notifications_admin_read', 'is_for_admin', 'is_read'),
+        Index('ix_ticket_notifications_user_admin_created', 'user_id', 'is_for_admin', 'created_at'),
     )
 
     id = Column(Integer, primary_key=True, index=True)
@@ -2975,8 +3143,8 @@ class TicketNotification(Base):
     created_at = Column(AwareDateTime(), default=func.now())
     read_at = Column(AwareDateTime(), nullable=True)
 
-    ticket = relationship('Ticket', backref='notifications')
-    user = relationship('User', backref='ticket_notifications')
+    ticket = relationship('Ticket', back_populates='notifications')
+    user = relationship('User', back_populates='ticket_notifications')
 
     def __repr__(self) -> str:
         return f'<TicketNotification id={self.id} type={self.notification_type} for_admin={self.is_for_admin}>'
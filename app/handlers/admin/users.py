@@ -27,8 +27,7 @@ from app.database.crud.tariff import get_all_tariffs, get_tariff_by_id
 from app.database.crud.user import (
     get_referrals,
     get_user_by_id,
-    get_user_by_telegram_id,
-    get_user_by_username,
+    get_users_by_telegram_ids_or_usernames,
 )
 from app.database.models import Subscription, SubscriptionStatus, TransactionType, User, UserStatus
 from app.keyboards.admin import (
@@ -1801,21 +1800,33 @@ async def process_edit_user_referrals(
 
     seen_ids = set()
 
+    # Токены нормализуются один раз: (исходный токен, вид ключа, ключ). Нераспознанный токен
+    # (например, цифры другой письменности, которые не берёт int()) остаётся без ключа
+    lookups: list[tuple[str, str | None, int | str | None]] = []
     for token in tokens:
-        normalized = token.strip()
-        if not normalized:
-            continue
-
-        normalized = normalized.removeprefix('@')
-
-        user = None
+        normalized = token.strip().removeprefix('@')
+        kind: str | None = None
+        key: int | str | None = None
         if normalized.isdigit():
             try:
-                user = await get_user_by_telegram_id(db, int(normalized))
+                kind, key = 'telegram_id', int(normalized)
             except ValueError:
-                user = None
-        else:
-            user = await get_user_by_username(db, normalized)
+                pass
+        elif normalized:
+            kind, key = 'username', normalized.lower()
+        lookups.append((token, kind, key))
+
+    # Один запрос на все токены вместо поиска по каждому
+    resolved_users = await get_users_by_telegram_ids_or_usernames(
+        db,
+        {key for _, kind, key in lookups if kind == 'telegram_id'},
+        {key for _, kind, key in lookups if kind == 'username'},
+    )
+    users_by_key = {('telegram_id', u.telegram_id): u for u in resolved_users if u.telegram_id is not None}
+    users_by_key.update({('username', u.username.lower()): u for u in resolved_users if u.username})
+
+    for token, kind, key in lookups:
+        user = users_by_key.get((kind, key))
 
         if not user:
             not_found.append(token)
@@ -1,6 +1,5 @@
 """Middleware для автоматического логирования кликов по кнопкам."""
 
-import asyncio
 from collections.abc import Awaitable, Callable
 from typing import Any
 
@@ -9,7 +8,7 @@ from aiogram import BaseMiddleware
 from aiogram.types import CallbackQuery, TelegramObject
 
 from app.config import settings
-from app.database.database import AsyncSessionLocal
+from app.services.menu_layout.click_buffer import button_click_buffer
 
 
 logger = structlog.get_logger(__name__)
@@ -111,8 +110,8 @@ class ButtonStatsMiddleware(BaseMiddleware):
             if not callback_data:
                 return await handler(event, data)
 
-            # Получаем user_id
-            user_id = event.from_user.id if event.from_user else None
+            # Получаем Telegram ID пользователя
+            telegram_id = event.from_user.id if event.from_user else None
 
             # Определяем тип кнопки по callback_data
             button_type = self._determine_button_type(callback_data)
@@ -122,15 +121,13 @@ class ButtonStatsMiddleware(BaseMiddleware):
             if event.message and hasattr(event.message, 'reply_markup'):
                 button_text = self._extract_button_text(event.message.reply_markup, callback_data)
 
-            # Логируем в фоне, не блокируя обработку
-            asyncio.create_task(
-                self._log_button_click_async(
-                    button_id=callback_data,
-                    user_id=user_id,
-                    callback_data=callback_data,
-                    button_type=button_type,
-                    button_text=button_text,
-                )
+            # Клик пишется в БД пачкой фоновой задачей буфера, обработка не блокируется
+            button_click_buffer.add(
+                button_id=callback_data,
+                telegram_id=telegram_id,
+                callback_data=callback_data,
+                button_type=button_type,
+                button_text=button_text,
             )
         except Exception as e:
             # Не прерываем обработку при ошибке логирования
@@ -180,30 +177,3 @@ class ButtonStatsMiddleware(BaseMiddleware):
         except Exception:
             pass
         return None
-
-    async def _log_button_click_async(
-        self,
-        button_id: str,
-        user_id: int = None,
-        callback_data: str = None,
-        button_type: str = None,
-        button_text: str = None,
-    ):
-        """Асинхронно логирует клик по кнопке."""
-        try:
-            async with AsyncSessionLocal() as db:
-                try:
-                    from app.services.menu_layout_service import MenuLayoutService
-
-                    await MenuLayoutService.log_button_click(
-                        db,
-                        button_id=button_id,
-                        user_id=user_id,
-                        callback_data=callback_data,
-                        button_type=button_type,
-                        button_text=button_text,
-                    )
-                except Exception as e:
-                    logger.warning('Ошибка записи клика в БД', button_id=button_id, error=e)
-        except Exception as e:
-            logger.warning('Ошибка создания сессии БД для логирования клика', error=e)
@@ -24,6 +24,7 @@ from sqlalchemy.orm import selectinload
 from sqlalchemy.pool import NullPool
 
 from app.config import settings
+from app.database.crud.ticket import TicketMessageCRUD
 from app.database.database import AsyncSessionLocal, engine, sync_postgres_sequences
 from app.database.models import (
     AccessPolicy,
@@ -1024,6 +1025,9 @@ class BackupService:
                 restored_tables += assoc_tables
                 restored_records += assoc_records
 
+                # Бэкап мог быть снят до появления счётчиков сообщений в тикетах - пересчитываем их
+                await TicketMessageCRUD.recalculate_ticket_stats(db)
+
                 await db.commit()
 
                 # Синхронизируем PostgreSQL sequences после ORM-восстановления,
@@ -18,6 +18,7 @@ from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.database.crud.ticket import TicketMessageCRUD
 from app.database.models import (
     AdvertisingCampaignRegistration,
     ButtonClickLog,
@@ -330,8 +331,13 @@ class BlockedUsersService:
 
             # 4. Тикеты (сначала зависимые)
             await db.execute(delete(TicketNotification).where(TicketNotification.user_id == user.id))
-            await db.execute(delete(TicketMessage).where(TicketMessage.user_id == user.id))
+            deleted_message_tickets = await db.execute(
+                delete(TicketMessage).where(TicketMessage.user_id == user.id).returning(TicketMessage.ticket_id)
+            )
+            affected_ticket_ids = set(deleted_message_tickets.scalars().all())
             await db.execute(delete(Ticket).where(Ticket.user_id == user.id))
+            # Сообщения пользователя могли быть и в чужих тикетах - пересчитываем их счётчики
+            await TicketMessageCRUD.recalculate_ticket_stats(db, affected_ticket_ids)
 
             # 5. Остальные связи
             await db.execute(delete(ReferralEarning).where(ReferralEarning.user_id == user.id))
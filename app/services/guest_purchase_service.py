@@ -7,7 +7,7 @@ from datetime import UTC, datetime, timedelta
 from typing import Literal
 
 import structlog
-from sqlalchemy import func, or_, select, update
+from sqlalchemy import func, literal_column, or_, select, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -673,7 +673,7 @@ async def _find_or_create_user(
 
     if not user:
         result = await db.execute(
-            select(User).where(func.lower(User.username) == normalized),
+            select(User).where(func.lower(User.username) == normalized).limit(1),
         )
         user = result.scalars().first()
 
@@ -718,7 +718,7 @@ async def _find_or_create_user(
                     default_group = await _get_or_create_default_promo_group(db)
                     user.promo_group_id = default_group.id
                 return user, False
-        result = await db.execute(select(User).where(func.lower(User.username) == normalized))
+        result = await db.execute(select(User).where(func.lower(User.username) == normalized).limit(1))
         user = result.scalars().first()
         if user:
             if not user.promo_group_id:
@@ -1509,7 +1509,8 @@ async def _find_succeeded_provider_payment(
 
     result = await db.execute(
         select(model).where(
-            model.metadata_json['purchase_token'].as_string() == purchase_token,
+            # Key is inlined so the expression matches the partial purchase_token indexes
+            model.metadata_json.op('->>')(literal_column("'purchase_token'")) == purchase_token,
             *extra_conditions,
         )
     )
@@ -6,9 +6,11 @@
 - context.py - MenuContext для построения меню
 - history_service.py - сервис истории изменений
 - stats_service.py - сервис статистики кликов
+- click_buffer.py - буферизованная запись кликов
 - service.py - основной MenuLayoutService
 """
 
+from .click_buffer import ButtonClickBuffer, button_click_buffer
 from .constants import (
     AVAILABLE_CALLBACKS,
     BUILTIN_BUTTONS_INFO,
@@ -30,8 +32,10 @@ __all__ = [
     # Константы
     'MENU_LAYOUT_CONFIG_KEY',
     # Классы
+    'ButtonClickBuffer',
     'MenuContext',
     'MenuLayoutHistoryService',
     'MenuLayoutService',
     'MenuLayoutStatsService',
+    'button_click_buffer',
 ]
@@ -0,0 +1,160 @@
+"""Буферизованная запись кликов по кнопкам меню.
+
+Middleware регистрирует клик на каждый CallbackQuery. Вместо отдельной сессии,
+поиска пользователя и INSERT + COMMIT на каждый клик, клики копятся в памяти и
+раз в секунду записываются пачкой: один SELECT пользователей и один
+многострочный INSERT на пачку. Пачка, которую не удалось записать, один раз
+возвращается в очередь (в пределах max_pending), остальное логируется как потерянное.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from datetime import UTC, datetime
+from typing import Any
+
+import structlog
+from sqlalchemy import insert, or_, select
+
+from app.database.database import AsyncSessionLocal
+from app.database.models import ButtonClickLog, User
+
+
+logger = structlog.get_logger(__name__)
+
+
+class ButtonClickBuffer:
+    """Копит клики по кнопкам и записывает их в БД пачками."""
+
+    def __init__(self, flush_interval: float = 1.0, max_batch_size: int = 500, max_pending: int = 10000):
+        self._flush_interval = flush_interval
+        self._max_batch_size = max_batch_size
+        self._max_pending = max_pending
+        self._pending: list[dict[str, Any]] = []
+        self._task: asyncio.Task | None = None
+        self._running = False
+        self._wakeup = asyncio.Event()
+
+    def add(
+        self,
+        button_id: str,
+        user_id: int | None = None,
+        telegram_id: int | None = None,
+        callback_data: str | None = None,
+        button_type: str | None = None,
+        button_text: str | None = None,
+    ) -> None:
+        """Поставить клик в очередь на запись. Фоновая запись запускается при первом клике.
+
+        Args:
+            user_id: internal User.id
+            telegram_id: Telegram ID пользователя (из middleware), используется, если user_id не задан
+        """
+        if len(self._pending) >= self._max_pending:
+            logger.warning('Буфер кликов переполнен, клик не записан', button_id=button_id)
+            return
+
+        self._pending.append(
+            {
+                'button_id': button_id,
+                'user_id': user_id,
+                'telegram_id': telegram_id if user_id is None else None,
+                'callback_data': callback_data,
+                'button_type': button_type,
+                'button_text': button_text,
+                'clicked_at': datetime.now(UTC),
+                'retried': False,
+            }
+        )
+
+        if self._task is None or self._task.done():
+            self._running = True
+            self._wakeup.clear()
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """Остановить фоновую запись и сохранить накопленные клики."""
+        self._running = False
+        self._wakeup.set()
+        if self._task and not self._task.done():
+            await self._task
+        self._task = None
+        # Каждый клик возвращается в очередь не больше одного раза, поэтому цикл конечен
+        while self._pending:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Записать все накопленные клики."""
+        batch, self._pending = self._pending, []
+        for start in range(0, len(batch), self._max_batch_size):
+            await self._write(batch[start : start + self._max_batch_size])
+
+    async def _flush_loop(self) -> None:
+        while self._running:
+            # stop() будит цикл, чтобы не ждать конца интервала при остановке
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._flush_interval)
+            await self.flush()
+
+    async def _write(self, batch: list[dict[str, Any]]) -> None:
+        user_ids = {row['user_id'] for row in batch if row['user_id'] is not None}
+        telegram_ids = {row['telegram_id'] for row in batch if row['telegram_id'] is not None}
+
+        async with AsyncSessionLocal() as db:
+            try:
+                # В FK пишем internal User.id; telegram_id и internal id сопоставляются раздельно,
+                # чтобы совпадение чисел не привязало клик к чужому пользователю
+                existing_user_ids: set[int] = set()
+                user_ids_by_telegram: dict[int, int] = {}
+                if user_ids or telegram_ids:
+                    result = await db.execute(
+                        select(User.id, User.telegram_id).where(
+                            or_(User.id.in_(user_ids), User.telegram_id.in_(telegram_ids))
+                        )
+                    )
+                    for internal_id, telegram_id in result.all():
+                        if internal_id in user_ids:
+                            existing_user_ids.add(internal_id)
+                        if telegram_id in telegram_ids:
+                            user_ids_by_telegram[telegram_id] = internal_id
+
+                rows = [
+                    {
+                        'button_id': row['button_id'],
+                        'user_id': (
+                            row['user_id']
+                            if row['user_id'] in existing_user_ids
+                            else user_ids_by_telegram.get(row['telegram_id'])
+                        ),
+                        'callback_data': row['callback_data'],
+                        'button_type': row['button_type'],
+                        'button_text': row['button_text'],
+                        'clicked_at': row['clicked_at'],
+                    }
+                    for row in batch
+                ]
+                await db.execute(insert(ButtonClickLog), rows)
+                await db.commit()
+            except Exception as e:
+                await db.rollback()
+                requeued = self._requeue(batch)
+                logger.warning(
+                    'Ошибка записи кликов в БД',
+                    count=len(batch),
+                    requeued=requeued,
+                    lost=len(batch) - requeued,
+                    error=e,
+                )
+
+    def _requeue(self, batch: list[dict[str, Any]]) -> int:
+        """Вернуть клики неудачной пачки в начало очереди: однократно и в пределах max_pending."""
+        free_slots = max(self._max_pending - len(self._pending), 0)
+        retry_rows = [row for row in batch if not row['retried']][:free_slots]
+        for row in retry_rows:
+            row['retried'] = True
+        self._pending[:0] = retry_rows
+        return len(retry_rows)
+
+
+button_click_buffer = ButtonClickBuffer()
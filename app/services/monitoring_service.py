@@ -17,6 +17,7 @@ from app.database.crud.discount_offer import (
 )
 from app.database.crud.notification import (
     clear_notification_by_type,
+    get_sent_notification_keys,
     notification_sent,
     record_notification,
 )
@@ -281,10 +282,11 @@ class MonitoringService:
 
     async def _check_expired_subscriptions(self, db: AsyncSession):
         try:
-            from app.database.crud.subscription import is_recently_updated_by_webhook
+            from app.database.crud.subscription import expire_subscription, is_recently_updated_by_webhook
 
             expired_subscriptions = await get_expired_subscriptions(db)
 
+            to_expire = []
             for subscription in expired_subscriptions:
                 if is_recently_updated_by_webhook(subscription):
                     logger.debug(
@@ -292,10 +294,14 @@ class MonitoringService:
                     )
                     continue
 
-                from app.database.crud.subscription import expire_subscription
+                await expire_subscription(db, subscription, commit=False)
+                to_expire.append(subscription)
 
-                await expire_subscription(db, subscription)
+            # Все статусы уходят одним flush/commit, уведомления — после фиксации
+            if to_expire:
+                await db.commit()
 
+            for subscription in to_expire:
                 user = await get_user_by_id(db, subscription.user_id)
                 if user and self.bot:
                     await self._send_subscription_expired_notification(user)
@@ -438,6 +444,11 @@ class MonitoringService:
 
                         users_with_cards = await get_user_ids_with_active_payment_methods(db, autopay_user_ids)
 
+                # Batch-запрос: уже отправленные уведомления за этот порог одним запросом вместо запроса на подписку
+                already_notified = await get_sent_notification_keys(
+                    db, [s.id for s in expiring_subscriptions], 'expiring', days
+                )
+
                 for subscription in expiring_subscriptions:
                     user = await get_user_by_id(db, subscription.user_id)
                     if not user:
@@ -447,10 +458,7 @@ class MonitoringService:
                     user_key = f'user_{user.id}_today'
                     user_identifier = user.telegram_id or f'email:{user.id}'
 
-                    if (
-                        await notification_sent(db, user.id, subscription.id, 'expiring', days)
-                        or user_key in all_processed_users
-                    ):
+                    if (user.id, subscription.id) in already_notified or user_key in all_processed_users:
                         logger.debug(
                             'Уведомление уже отправлено, пропускаем',
                             user_identifier=user_identifier,
@@ -1988,7 +1996,7 @@ class MonitoringService:
 
     async def get_monitoring_status(self, db: AsyncSession) -> dict[str, Any]:
         try:
-            from sqlalchemy import desc, select
+            from sqlalchemy import case, desc, func, select
 
             recent_events_result = await db.execute(
                 select(MonitoringLog).order_by(desc(MonitoringLog.created_at)).limit(10)
@@ -1997,11 +2005,15 @@ class MonitoringService:
 
             yesterday = datetime.now(UTC) - timedelta(days=1)
 
-            events_24h_result = await db.execute(select(MonitoringLog).where(MonitoringLog.created_at >= yesterday))
-            events_24h = events_24h_result.scalars().all()
-
-            successful_events = sum(1 for event in events_24h if event.is_success)
-            failed_events = sum(1 for event in events_24h if not event.is_success)
+            # Считаем события за сутки в БД, не загружая строки с JSON-данными
+            stats_24h_result = await db.execute(
+                select(
+                    func.count(MonitoringLog.id),
+                    func.count(case((MonitoringLog.is_success.is_(True), 1))),
+                ).where(MonitoringLog.created_at >= yesterday)
+            )
+            total_events, successful_events = stats_24h_result.one()
+            failed_events = total_events - successful_events
 
             return {
                 'is_running': self.is_running,
@@ -2016,10 +2028,10 @@ class MonitoringService:
                     for event in recent_events
                 ],
                 'stats_24h': {
-                    'total_events': len(events_24h),
+                    'total_events': total_events,
                     'successful': successful_events,
                     'failed': failed_events,
-                    'success_rate': round(successful_events / len(events_24h) * 100, 1) if events_24h else 0,
+                    'success_rate': round(successful_events / total_events * 100, 1) if total_events else 0,
                 },
             }
 
@@ -2045,9 +2057,13 @@ class MonitoringService:
                         'Пропуск force-check подписки : обновлена вебхуком недавно', subscription_id=subscription.id
                     )
                     continue
-                await deactivate_subscription(db, subscription)
+                await deactivate_subscription(db, subscription, commit=False)
                 expired_count += 1
 
+            # Один flush/commit на все подписки вместо commit + refresh на каждую
+            if expired_count:
+                await db.commit()
+
             expiring_subscriptions = await get_expiring_subscriptions(db, 1)
             expiring_count = len(expiring_subscriptions)
 
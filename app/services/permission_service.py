@@ -6,9 +6,12 @@ attribute-based access policies (time ranges, IP whitelists).
 
 from __future__ import annotations
 
+import functools
 import ipaddress
+import re
+from collections.abc import Callable
 from datetime import UTC, datetime
-from fnmatch import fnmatch
+from fnmatch import translate
 from typing import TYPE_CHECKING
 
 import structlog
@@ -90,6 +93,19 @@ def get_all_permissions() -> list[str]:
     return [f'{section}:{action}' for section, actions in PERMISSION_REGISTRY.items() for action in actions]
 
 
+@functools.cache
+def _compile_pattern(pattern: str) -> Callable[[str], bool]:
+    """Build a matcher for an fnmatch *pattern*, specialized once per pattern.
+
+    Patterns without wildcards become a plain string comparison; the rest are
+    translated to a compiled regex so no per-call pattern parsing is needed.
+    """
+    if not any(char in pattern for char in '*?['):
+        return pattern.__eq__
+    match = re.compile(translate(pattern)).match
+    return lambda value: match(value) is not None
+
+
 def permission_matches(user_perm: str, required_perm: str) -> bool:
     """Check if *user_perm* grants access for *required_perm*.
 
@@ -98,7 +114,7 @@ def permission_matches(user_perm: str, required_perm: str) -> bool:
     - ``users:*``    matches ``users:read``, ``users:edit``, ...
     - ``users:read`` matches only ``users:read``
     """
-    return fnmatch(required_perm, user_perm)
+    return _compile_pattern(user_perm)(required_perm)
 
 
 # ---------------------------------------------------------------------------
@@ -117,11 +133,11 @@ def _policy_matches_resource(policy: AccessPolicy, required_perm: str) -> bool:
 
     section, action = required_perm.split(':', maxsplit=1)
 
-    if not fnmatch(section, policy.resource):
+    if not _compile_pattern(policy.resource)(section):
         return False
 
     policy_actions: list[str] = policy.actions or []
-    return any(fnmatch(action, pattern) for pattern in policy_actions)
+    return any(_compile_pattern(pattern)(action) for pattern in policy_actions)
 
 
 def _evaluate_conditions(
@@ -214,7 +230,7 @@ class PermissionService:
         Returns ``(allowed, reason)`` tuple.
 
         Algorithm:
-        1. Aggregate user permissions via ``UserRoleCRUD.get_user_permissions``.
+        1. Load the user's roles once and aggregate their permissions.
         2. Check if any RBAC permission matches the required one (fnmatch).
         3. If base RBAC permission is **not** granted -- deny immediately.
         4. Fetch ABAC policies applicable to the user's roles.
@@ -225,8 +241,9 @@ class PermissionService:
         if _is_legacy_admin(user):
             return True, 'Granted by legacy admin config'
 
-        # Step 1 -- aggregate RBAC permissions
-        permissions, role_names, max_level = await UserRoleCRUD.get_user_permissions(db, user.id)
+        # Step 1 -- aggregate RBAC permissions (roles are reused for the ABAC step)
+        user_roles = await UserRoleCRUD.get_user_roles(db, user.id)
+        permissions, _role_names, _max_level = UserRoleCRUD.aggregate_permissions(user_roles)
 
         if not permissions:
             logger.debug(
@@ -249,7 +266,6 @@ class PermissionService:
             return False, 'Permission not granted by any role'
 
         # Step 3 -- load ABAC policies for the user's roles
-        user_roles = await UserRoleCRUD.get_user_roles(db, user.id)
         role_ids = [ur.role_id for ur in user_roles]
         policies = await AccessPolicyCRUD.get_policies_for_user(db, role_ids)
 
@@ -11,6 +11,7 @@ from sqlalchemy.orm import selectinload
 from app.config import settings
 from app.database.crud.promo_group import get_promo_group_by_id
 from app.database.crud.subscription import get_subscription_by_user_id
+from app.database.crud.ticket import TicketMessageCRUD
 from app.database.crud.transaction import get_user_transactions_count
 from app.database.crud.user import (
     add_user_balance,
@@ -1262,7 +1263,10 @@ class UserService:
                 await db.execute(update(AdminRole).where(AdminRole.created_by == user_id).values(created_by=None))
                 await db.execute(update(UserRole).where(UserRole.assigned_by == user_id).values(assigned_by=None))
                 await db.execute(update(AccessPolicy).where(AccessPolicy.created_by == user_id).values(created_by=None))
+                # Каскад FK удалит и ответы пользователя в чужих тикетах - их счётчики пересчитываем
+                affected_ticket_ids = await TicketMessageCRUD.get_ticket_ids_with_user_messages(db, user_id)
                 await db.execute(delete(User).where(User.id == user_id))
+                await TicketMessageCRUD.recalculate_ticket_stats(db, affected_ticket_ids)
                 await db.commit()
                 logger.info('✅ Пользователь окончательно удален из базы', user_id=user_id)
             except Exception as e:
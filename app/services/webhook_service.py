@@ -77,13 +77,16 @@ class WebhookService:
         tasks = [self._deliver_webhook_http(webhook, event_type, payload) for webhook in webhooks]
         results = await asyncio.gather(*tasks, return_exceptions=True)
 
-        # Записываем результаты в БД последовательно (избегаем concurrent session access)
+        delivered: list[DeliveryResult] = []
         for result in results:
             if isinstance(result, Exception):
                 logger.exception('Unexpected error during webhook delivery', result=result)
                 continue
             if isinstance(result, DeliveryResult):
-                await self._record_result(db, result)
+                delivered.append(result)
+
+        if delivered:
+            await self._record_results(db, delivered)
 
     async def _deliver_webhook_http(
         self,
@@ -149,28 +152,46 @@ class WebhookService:
                 error_message=str(error),
             )
 
-    async def _record_result(self, db: AsyncSession, result: DeliveryResult) -> None:
-        """Записать результат доставки в БД (последовательно)."""
-        try:
-            await record_webhook_delivery(
-                db,
-                webhook_id=result.webhook.id,
-                event_type=result.event_type,
-                payload=result.payload,
-                status=result.status,
-                response_status=result.response_status,
-                response_body=result.response_body,
-                error_message=result.error_message,
-            )
+    async def _record_results(self, db: AsyncSession, results: list[DeliveryResult]) -> None:
+        """Записать результаты доставки и статистику webhooks в БД одним коммитом.
+
+        Каждая доставка пишется в своей точке сохранения: ошибка одной записи не откатывает остальные.
+        """
+        recorded: list[tuple[DeliveryResult, int, str]] = []
+        for result in results:
+            # После отката точки сохранения атрибуты webhook истекают, поэтому берём их заранее
+            webhook_id, webhook_url = result.webhook.id, result.webhook.url
+            try:
+                async with db.begin_nested():
+                    await record_webhook_delivery(
+                        db,
+                        webhook_id=webhook_id,
+                        event_type=result.event_type,
+                        payload=result.payload,
+                        status=result.status,
+                        response_status=result.response_status,
+                        response_body=result.response_body,
+                        error_message=result.error_message,
+                        commit=False,
+                    )
+                    await update_webhook_stats(db, result.webhook, result.status == 'success', commit=False)
+            except Exception as error:
+                logger.exception('Failed to record webhook delivery result', id=webhook_id, error=error)
+                continue
+            recorded.append((result, webhook_id, webhook_url))
 
-            await update_webhook_stats(db, result.webhook, result.status == 'success')
+        try:
+            await db.commit()
+        except Exception as error:
+            logger.exception('Failed to commit webhook delivery results', count=len(recorded), error=error)
+            await db.rollback()
+            return
 
+        for result, webhook_id, webhook_url in recorded:
             if result.status == 'success':
-                logger.info('Webhook delivered successfully to', id=result.webhook.id, url=result.webhook.url)
+                logger.info('Webhook delivered successfully to', id=webhook_id, url=webhook_url)
             else:
-                logger.warning('Webhook delivery failed', id=result.webhook.id, error_message=result.error_message)
-        except Exception as error:
-            logger.exception('Failed to record webhook delivery result for', id=result.webhook.id, error=error)
+                logger.warning('Webhook delivery failed', id=webhook_id, error_message=result.error_message)
 
 
 # Глобальный экземпляр сервиса
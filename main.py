@@ -25,6 +25,7 @@ from app.services.daily_subscription_service import daily_subscription_service
 from app.services.external_admin_service import ensure_external_admin_token
 from app.services.log_rotation_service import log_rotation_service
 from app.services.maintenance_service import maintenance_service
+from app.services.menu_layout.click_buffer import button_click_buffer
 from app.services.monitoring_service import monitoring_service
 from app.services.nalogo_queue_service import nalogo_queue_service
 from app.services.payment_service import PaymentService
@@ -939,6 +940,12 @@ async def main():
             except Exception as error:
                 logger.error('Ошибка остановки веб-API', error=error)
 
+        logger.info('ℹ️ Запись накопленных кликов по кнопкам...')
+        try:
+            await button_click_buffer.stop()
+        except Exception as e:
+            logger.error('Ошибка записи накопленных кликов', error=e)
+
         try:
             await riopay_service.close()
         except Exception as e:
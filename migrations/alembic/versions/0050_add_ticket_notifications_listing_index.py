@@ -0,0 +1,37 @@
+"""add composite index on ticket_notifications for user listing
+
+Revision ID: 0050
+Revises: 0049
+Create Date: 2026-10-15
+
+The cabinet notification list filters by user_id and is_for_admin and
+orders by created_at DESC. Without a matching index Postgres reads all
+of the user's rows and sorts them; (user_id, is_for_admin, created_at)
+serves the page straight from the index via a backward scan. Unread
+counts are already covered by ix_ticket_notifications_user_read.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = '0050'
+down_revision: str | None = '0049'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            sa.text(
+                'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_ticket_notifications_user_admin_created '
+                'ON ticket_notifications (user_id, is_for_admin, created_at)'
+            )
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(sa.text('DROP INDEX CONCURRENTLY IF EXISTS ix_ticket_notifications_user_admin_created'))
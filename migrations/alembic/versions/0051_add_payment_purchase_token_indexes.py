@@ -0,0 +1,56 @@
+"""add partial purchase_token indexes on provider payment tables
+
+Revision ID: 0051
+Revises: 0050
+Create Date: 2026-10-15
+
+Guest purchase recovery looks up the provider payment by
+metadata_json ->> 'purchase_token', which was a sequential scan over the
+whole payment table. A partial expression index per table only covers
+rows that carry a purchase token (guest purchases), so it stays small.
+The columns stay JSON: converting them to JSONB would rewrite every
+payment table under an exclusive lock without speeding up this lookup.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = '0051'
+down_revision: str | None = '0050'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+_PAYMENT_TABLES = (
+    'yookassa_payments',
+    'heleket_payments',
+    'mulenpay_payments',
+    'pal24_payments',
+    'wata_payments',
+    'platega_payments',
+    'cloudpayments_payments',
+    'freekassa_payments',
+    'kassa_ai_payments',
+    'riopay_payments',
+    'severpay_payments',
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in _PAYMENT_TABLES:
+            op.execute(
+                sa.text(
+                    f'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_purchase_token '
+                    f"ON {table} ((metadata_json ->> 'purchase_token')) "
+                    "WHERE metadata_json ->> 'purchase_token' IS NOT NULL"
+                )
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in _PAYMENT_TABLES:
+            op.execute(sa.text(f'DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_purchase_token'))
@@ -0,0 +1,52 @@
+"""add created_at indexes on provider payment tables
+
+Revision ID: 0052
+Revises: 0051
+Create Date: 2026-10-15
+
+list_recent_pending_payments (auto-check job, admin and cabinet pending
+views) and the admin payment search both filter every provider table by
+created_at >= cutoff and order by created_at DESC. None of the payment
+tables had an index on created_at, so each call scanned all of them in
+full. A plain created_at index serves the range and the ordering.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = '0052'
+down_revision: str | None = '0051'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+_PAYMENT_TABLES = (
+    'yookassa_payments',
+    'cryptobot_payments',
+    'heleket_payments',
+    'mulenpay_payments',
+    'pal24_payments',
+    'wata_payments',
+    'platega_payments',
+    'cloudpayments_payments',
+    'freekassa_payments',
+    'kassa_ai_payments',
+    'riopay_payments',
+    'severpay_payments',
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in _PAYMENT_TABLES:
+            op.execute(
+                sa.text(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_created_at ON {table} (created_at)')
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in _PAYMENT_TABLES:
+            op.execute(sa.text(f'DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_created_at'))
@@ -0,0 +1,57 @@
+"""add partial transaction_id indexes on provider payment tables
+
+Revision ID: 0053
+Revises: 0052
+Create Date: 2026-10-15
+
+transaction_id on the provider payment tables is a foreign key to
+transactions.id without any index. Every DELETE FROM transactions (user
+cleanup in remnawave/blocked-users/user services) makes PostgreSQL check
+each of the twelve tables for referencing rows, and that check was a
+sequential scan per table. Most payments never get a transaction (pending,
+expired, cancelled), so the index is partial on transaction_id IS NOT NULL
+and stays small; equality lookups still use it.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = '0053'
+down_revision: str | None = '0052'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+_PAYMENT_TABLES = (
+    'yookassa_payments',
+    'cryptobot_payments',
+    'heleket_payments',
+    'mulenpay_payments',
+    'pal24_payments',
+    'wata_payments',
+    'platega_payments',
+    'cloudpayments_payments',
+    'freekassa_payments',
+    'kassa_ai_payments',
+    'riopay_payments',
+    'severpay_payments',
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in _PAYMENT_TABLES:
+            op.execute(
+                sa.text(
+                    f'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_transaction_id '
+                    f'ON {table} (transaction_id) WHERE transaction_id IS NOT NULL'
+                )
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in _PAYMENT_TABLES:
+            op.execute(sa.text(f'DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_transaction_id'))
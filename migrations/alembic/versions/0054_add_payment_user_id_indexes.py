@@ -0,0 +1,48 @@
+"""add user_id indexes on provider payment tables
+
+Revision ID: 0054
+Revises: 0053
+Create Date: 2026-10-15
+
+Only riopay_payments and severpay_payments declared user_id with
+index=True; the other ten provider tables had the foreign key without an
+index. Per-user payment lookups (pending payments in the cabinet, payment
+history, account merge) and the ON DELETE CASCADE check on user removal
+scanned those tables in full.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = '0054'
+down_revision: str | None = '0053'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+_PAYMENT_TABLES = (
+    'yookassa_payments',
+    'cryptobot_payments',
+    'heleket_payments',
+    'mulenpay_payments',
+    'pal24_payments',
+    'wata_payments',
+    'platega_payments',
+    'cloudpayments_payments',
+    'freekassa_payments',
+    'kassa_ai_payments',
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in _PAYMENT_TABLES:
+            op.execute(sa.text(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_user_id ON {table} (user_id)'))
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in _PAYMENT_TABLES:
+            op.execute(sa.text(f'DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_user_id'))
@@ -0,0 +1,37 @@
+"""add partial end_date index for active subscriptions
+
+Revision ID: 0055
+Revises: 0054
+Create Date: 2026-10-15
+
+The monitoring jobs (get_expired_subscriptions, get_expiring_subscriptions)
+select subscriptions with status = 'active' and end_date before or within a
+threshold. subscriptions had no index on end_date, so every run scanned the
+whole table. The index is partial on the active status, which is the only
+one those jobs look at.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = '0055'
+down_revision: str | None = '0054'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            sa.text(
+                'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_subscriptions_active_end_date '
+                "ON subscriptions (end_date) WHERE status = 'active'"
+            )
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(sa.text('DROP INDEX CONCURRENTLY IF EXISTS ix_subscriptions_active_end_date'))
@@ -0,0 +1,48 @@
+"""add sent_notifications lookup index and active discount offer expiry index
+
+Revision ID: 0056
+Revises: 0055
+Create Date: 2026-10-15
+
+sent_notifications had only its primary key. notification_sent() runs for
+every candidate subscription on each monitoring sweep (filtering by
+subscription_id and notification_type), and clear_notifications() plus the
+ON DELETE CASCADE from subscriptions delete by subscription_id, so each of
+those scanned the whole, ever-growing table.
+
+deactivate_expired_offers() selects discount_offers with is_active = true
+and expires_at < now on every run; a partial index on expires_at limited to
+active offers serves that range without touching the deactivated history.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = '0056'
+down_revision: str | None = '0055'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            sa.text(
+                'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_sent_notifications_sub_type '
+                'ON sent_notifications (subscription_id, notification_type)'
+            )
+        )
+        op.execute(
+            sa.text(
+                'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_discount_offers_active_expires '
+                'ON discount_offers (expires_at) WHERE is_active = true'
+            )
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(sa.text('DROP INDEX CONCURRENTLY IF EXISTS ix_discount_offers_active_expires'))
+        op.execute(sa.text('DROP INDEX CONCURRENTLY IF EXISTS ix_sent_notifications_sub_type'))
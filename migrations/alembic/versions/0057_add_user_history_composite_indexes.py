@@ -0,0 +1,47 @@
+"""add (user_id, time) indexes for referral earnings and subscription events
+
+Revision ID: 0057
+Revises: 0056
+Create Date: 2026-10-15
+
+The referral earnings history (get_referral_earnings_by_user) and the
+per-user subscription event feed (list_subscription_events with user_id)
+filter by user and order by created_at / occurred_at DESC with a LIMIT.
+referral_earnings only had a user_id index, so every page sorted all of the
+user's rows; subscription_events had no user_id index at all. A composite
+index lets both read the newest rows straight off the index (PostgreSQL
+scans it backwards for DESC) and also serves the referral period sums that
+filter user_id plus created_at >= start.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = '0057'
+down_revision: str | None = '0056'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            sa.text(
+                'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_referral_earnings_user_created '
+                'ON referral_earnings (user_id, created_at)'
+            )
+        )
+        op.execute(
+            sa.text(
+                'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_subscription_events_user_occurred '
+                'ON subscription_events (user_id, occurred_at)'
+            )
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(sa.text('DROP INDEX CONCURRENTLY IF EXISTS ix_subscription_events_user_occurred'))
+        op.execute(sa.text('DROP INDEX CONCURRENTLY IF EXISTS ix_referral_earnings_user_created'))
@@ -0,0 +1,32 @@
+"""drop idx_contest_attempt_round covered by uq_round_user_attempt
+
+Revision ID: 0058
+Revises: 0057
+Create Date: 2026-10-15
+
+contest_attempts has a unique constraint on (round_id, user_id), whose
+index already serves every lookup by round_id alone. The separate
+idx_contest_attempt_round only added work to each attempt insert.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = '0058'
+down_revision: str | None = '0057'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(sa.text('DROP INDEX CONCURRENTLY IF EXISTS idx_contest_attempt_round'))
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            sa.text('CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_contest_attempt_round ON contest_attempts (round_id)')
+        )
@@ -0,0 +1,40 @@
+"""widen referral_contest_virtual_participants.total_amount_kopeks to bigint
+
+Revision ID: 0059
+Revises: 0058
+Create Date: 2026-10-15
+
+total_amount_kopeks holds a contest-wide aggregate and is merged with
+SUM(amount_kopeks) results in the leaderboard. As a 32-bit integer it
+overflows at 2 147 483 647 kopeks (~21.4M RUB).
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = '0059'
+down_revision: str | None = '0058'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        'referral_contest_virtual_participants',
+        'total_amount_kopeks',
+        type_=sa.BigInteger(),
+        existing_type=sa.Integer(),
+        existing_nullable=False,
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'referral_contest_virtual_participants',
+        'total_amount_kopeks',
+        type_=sa.Integer(),
+        existing_type=sa.BigInteger(),
+        existing_nullable=False,
+    )
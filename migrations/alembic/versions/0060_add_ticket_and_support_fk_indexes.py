@@ -0,0 +1,47 @@
+"""add indexes on unindexed ticket, support audit, wheel and server foreign keys
+
+Revision ID: 0060
+Revises: 0059
+Create Date: 2026-10-15
+
+PostgreSQL does not index foreign keys automatically. Ticket lists per user,
+message history per ticket, per-squad subscription counts and the
+ON DELETE CASCADE / SET NULL checks on users, tickets, wheel_prizes and
+server_squads scanned these tables in full. webhook_deliveries.webhook_id,
+wheel_spins.user_id and advertising_campaign_registrations FKs are already
+covered by existing composite indexes.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = '0060'
+down_revision: str | None = '0059'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+_INDEXES = (
+    ('ix_subscription_servers_server_squad_id', 'subscription_servers', 'server_squad_id'),
+    ('ix_tickets_user_id', 'tickets', 'user_id'),
+    ('ix_ticket_messages_ticket_created', 'ticket_messages', 'ticket_id, created_at'),
+    ('ix_ticket_messages_user_id', 'ticket_messages', 'user_id'),
+    ('ix_wheel_spins_prize_id', 'wheel_spins', 'prize_id'),
+    ('ix_support_audit_logs_actor_user_id', 'support_audit_logs', 'actor_user_id'),
+    ('ix_support_audit_logs_ticket_id', 'support_audit_logs', 'ticket_id'),
+    ('ix_support_audit_logs_target_user_id', 'support_audit_logs', 'target_user_id'),
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in _INDEXES:
+            op.execute(sa.text(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns})'))
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _table, _columns in _INDEXES:
+            op.execute(sa.text(f'DROP INDEX CONCURRENTLY IF EXISTS {name}'))
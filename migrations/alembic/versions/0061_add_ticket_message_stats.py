@@ -0,0 +1,44 @@
+"""add message_count and last_message_at to tickets
+
+Revision ID: 0061
+Revises: 0060
+Create Date: 2026-10-15
+
+Ticket lists show the number of messages in each ticket. Counting
+ticket_messages for every page is replaced by denormalized columns on
+tickets, backfilled here once. After that they are maintained in app code:
+TicketMessageCRUD.insert_message on every new message and
+TicketMessageCRUD.recalculate_ticket_stats after messages are deleted or
+restored from a backup.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = '0061'
+down_revision: str | None = '0060'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column('tickets', sa.Column('message_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('tickets', sa.Column('last_message_at', sa.DateTime(timezone=True), nullable=True))
+
+    op.execute(
+        sa.text(
+            'UPDATE tickets SET message_count = stats.cnt, last_message_at = stats.last_at '
+            'FROM ('
+            '    SELECT ticket_id, COUNT(*) AS cnt, MAX(created_at) AS last_at '
+            '    FROM ticket_messages GROUP BY ticket_id'
+            ') AS stats '
+            'WHERE tickets.id = stats.ticket_id'
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('tickets', 'last_message_at')
+    op.drop_column('tickets', 'message_count')
@@ -0,0 +1,36 @@
+"""add partial (status, updated_at) index for non-closed tickets
+
+Revision ID: 0062
+Revises: 0061
+Create Date: 2026-10-15
+
+Support queues (admin ticket lists, SLA reminders, open ticket counters)
+filter tickets by open/answered/pending status and order by updated_at.
+Closed tickets make up most of the table over time, so the index only
+covers rows with status <> 'closed'.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = '0062'
+down_revision: str | None = '0061'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            sa.text(
+                'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tickets_open_updated '
+                "ON tickets (status, updated_at) WHERE status <> 'closed'"
+            )
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(sa.text('DROP INDEX CONCURRENTLY IF EXISTS ix_tickets_open_updated'))
@@ -0,0 +1,113 @@
+"""Тесты сводной статистики рекламных кампаний."""
+
+from app.database.crud.campaign import get_campaign_statistics, get_campaigns_summary_statistics
+from app.database.models import (
+    AdvertisingCampaign,
+    AdvertisingCampaignRegistration,
+    PaymentMethod,
+    Subscription,
+    SubscriptionConversion,
+    Transaction,
+    TransactionType,
+    User,
+)
+
+
+TABLES = (User, AdvertisingCampaign, AdvertisingCampaignRegistration, Transaction, Subscription, SubscriptionConversion)
+
+SUMMARY_KEYS = (
+    'registrations',
+    'total_revenue_kopeks',
+    'conversion_count',
+    'conversion_rate',
+    'avg_revenue_per_user_kopeks',
+)
+
+
+def _deposit(user: User, amount_kopeks: int, payment_method: str) -> Transaction:
+    return Transaction(
+        user_id=user.id,
+        type=TransactionType.DEPOSIT.value,
+        amount_kopeks=amount_kopeks,
+        payment_method=payment_method,
+        is_completed=True,
+    )
+
+
+def _subscription_payment(user: User, amount_kopeks: int) -> Transaction:
+    return Transaction(
+        user_id=user.id,
+        type=TransactionType.SUBSCRIPTION_PAYMENT.value,
+        amount_kopeks=-amount_kopeks,
+        is_completed=True,
+    )
+
+
+async def test_summary_statistics_match_per_campaign_statistics(sqlite_session):
+    async with sqlite_session(*TABLES) as db:
+        payer, flagged, idle, converted, pending = (
+            User(telegram_id=100 + index, first_name=f'User {index}') for index in range(5)
+        )
+        # flagged платил когда-то раньше, но транзакций и конверсии нет - учитывается только в conversion_rate
+        payer.has_had_paid_subscription = True
+        flagged.has_had_paid_subscription = True
+        db.add_all([payer, flagged, idle, converted, pending])
+        spring, autumn, empty = (
+            AdvertisingCampaign(name=name, start_parameter=name, bonus_type='balance')
+            for name in ('spring', 'autumn', 'empty')
+        )
+        db.add_all([spring, autumn, empty])
+        await db.flush()
+
+        db.add_all(
+            [
+                AdvertisingCampaignRegistration(campaign_id=spring.id, user_id=user.id, bonus_type='balance')
+                for user in (payer, flagged, idle)
+            ]
+            + [
+                AdvertisingCampaignRegistration(campaign_id=autumn.id, user_id=user.id, bonus_type='balance')
+                for user in (payer, converted, pending)
+            ]
+        )
+        db.add_all(
+            [
+                _deposit(payer, 50000, PaymentMethod.YOOKASSA.value),
+                _deposit(payer, 20000, PaymentMethod.CRYPTOBOT.value),
+                _subscription_payment(payer, 30000),
+                _subscription_payment(payer, 15000),
+                # Начисление администратором - не выручка
+                _deposit(flagged, 99900, PaymentMethod.MANUAL.value),
+                _deposit(converted, 12000, PaymentMethod.YOOKASSA.value),
+                SubscriptionConversion(user_id=converted.id, first_payment_amount_kopeks=12000),
+                Transaction(
+                    user_id=pending.id,
+                    type=TransactionType.DEPOSIT.value,
+                    amount_kopeks=7000,
+                    payment_method=PaymentMethod.YOOKASSA.value,
+                    is_completed=False,
+                ),
+            ]
+        )
+        await db.commit()
+
+        campaign_ids = [spring.id, autumn.id, empty.id]
+        summary = await get_campaigns_summary_statistics(db, campaign_ids)
+
+        for campaign_id in campaign_ids:
+            detailed = await get_campaign_statistics(db, campaign_id)
+            assert summary[campaign_id] == {key: detailed[key] for key in SUMMARY_KEYS}
+
+        assert summary[spring.id] == {
+            'registrations': 3,
+            'total_revenue_kopeks': 70000,
+            'conversion_count': 1,
+            'conversion_rate': 66.7,
+            'avg_revenue_per_user_kopeks': 23333,
+        }
+        assert summary[autumn.id]['conversion_count'] == 2
+        assert summary[empty.id]['registrations'] == 0
+
+
+async def test_summary_statistics_empty_input(sqlite_session):
+    async with sqlite_session(*TABLES) as db:
+        assert await get_campaigns_summary_statistics(db, []) == {}
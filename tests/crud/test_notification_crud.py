@@ -0,0 +1,30 @@
+"""Тесты пакетной проверки отправленных уведомлений."""
+
+from app.database.crud.notification import get_sent_notification_keys
+from app.database.models import SentNotification
+
+
+async def test_get_sent_notification_keys_queries_in_chunks(sqlite_session):
+    async with sqlite_session(SentNotification) as db:
+        db.add_all(
+            [
+                SentNotification(
+                    user_id=subscription_id * 10,
+                    subscription_id=subscription_id,
+                    notification_type='expiring',
+                    days_before=3,
+                )
+                for subscription_id in range(1, 8)
+            ]
+            + [
+                # Другой порог и другой тип уведомления не считаются отправленными
+                SentNotification(user_id=80, subscription_id=8, notification_type='expiring', days_before=1),
+                SentNotification(user_id=90, subscription_id=9, notification_type='expired_1d', days_before=3),
+            ]
+        )
+        await db.commit()
+
+        keys = await get_sent_notification_keys(db, list(range(1, 11)), 'expiring', 3, chunk_size=3)
+
+        assert keys == {(subscription_id * 10, subscription_id) for subscription_id in range(1, 8)}
+        assert await get_sent_notification_keys(db, [], 'expiring', 3) == set()
@@ -0,0 +1,49 @@
+"""Тесты загрузки связей платежей с пользователем."""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import InvalidRequestError
+
+from app.database.crud.freekassa import get_expired_pending_payments
+from app.database.models import FreekassaPayment, Transaction, User
+
+
+TABLES = (User, Transaction, FreekassaPayment)
+
+
+async def _seed_expired_payment(db) -> None:
+    user = User(telegram_id=111, first_name='Payer')
+    db.add(user)
+    await db.flush()
+    db.add(
+        FreekassaPayment(
+            user_id=user.id,
+            order_id='fk-1',
+            amount_kopeks=10000,
+            expires_at=datetime.now(UTC) - timedelta(hours=1),
+        )
+    )
+    await db.commit()
+    # Сбрасываем identity map, чтобы связь нельзя было взять без запроса
+    db.expunge_all()
+
+
+async def test_implicit_lazy_load_raises_in_tests(sqlite_session):
+    async with sqlite_session(*TABLES) as db:
+        await _seed_expired_payment(db)
+
+        payment = (await db.execute(select(FreekassaPayment))).scalar_one()
+
+        with pytest.raises(InvalidRequestError):
+            _ = payment.user
+
+
+async def test_expired_pending_payments_load_user(sqlite_session):
+    async with sqlite_session(*TABLES) as db:
+        await _seed_expired_payment(db)
+
+        payments = await get_expired_pending_payments(db)
+
+    assert [payment.user.telegram_id for payment in payments] == [111]
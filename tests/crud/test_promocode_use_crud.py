@@ -0,0 +1,43 @@
+"""Тесты записи использования промокода."""
+
+from sqlalchemy import func, select
+
+from app.database.crud.promocode import create_promocode_use
+from app.database.models import PromoCode, PromoCodeType, PromoCodeUse, User
+
+
+TABLES = (User, PromoCode, PromoCodeUse)
+
+
+async def _seed(db) -> tuple[User, PromoCode]:
+    user = User(telegram_id=111, first_name='User')
+    promocode = PromoCode(code='BONUS', type=PromoCodeType.BALANCE.value, balance_bonus_kopeks=1000)
+    db.add_all([user, promocode])
+    await db.commit()
+    return user, promocode
+
+
+async def test_create_promocode_use_records_first_use(sqlite_session):
+    async with sqlite_session(*TABLES) as db:
+        user, promocode = await _seed(db)
+
+        use = await create_promocode_use(db, promocode.id, user.id)
+        await db.commit()
+
+        assert use is not None
+        assert use.id is not None
+        assert (use.user_id, use.promocode_id) == (user.id, promocode.id)
+        assert use.used_at is not None
+
+
+async def test_duplicate_promocode_use_returns_none(sqlite_session):
+    async with sqlite_session(*TABLES) as db:
+        user, promocode = await _seed(db)
+
+        assert await create_promocode_use(db, promocode.id, user.id) is not None
+        # Дубль не поднимает IntegrityError и не ломает транзакцию
+        assert await create_promocode_use(db, promocode.id, user.id) is None
+        await db.commit()
+
+        count = await db.scalar(select(func.count()).select_from(PromoCodeUse))
+        assert count == 1
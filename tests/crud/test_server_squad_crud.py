@@ -0,0 +1,86 @@
+"""Тесты промогрупп серверов: связь allowed_promo_groups не грузится неявно."""
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.exc import InvalidRequestError
+
+from app.database.crud.server_squad import (
+    create_server_squad,
+    get_server_squad_by_id,
+    update_server_squad_promo_groups,
+)
+from app.database.models import PromoGroup, ServerSquad, SubscriptionServer, server_squad_promo_groups
+
+
+TABLES = (PromoGroup, ServerSquad, server_squad_promo_groups, SubscriptionServer)
+
+
+async def _seed_promo_groups(db) -> tuple[PromoGroup, PromoGroup]:
+    default_group = PromoGroup(name='Базовая', is_default=True)
+    vip_group = PromoGroup(name='VIP', priority=10)
+    db.add_all([default_group, vip_group])
+    await db.commit()
+    return default_group, vip_group
+
+
+async def test_create_server_squad_returns_loaded_promo_groups(sqlite_session):
+    async with sqlite_session(*TABLES) as db:
+        default_group, vip_group = await _seed_promo_groups(db)
+
+        server = await create_server_squad(db, 'uuid-1', 'NL-1', promo_group_ids=[vip_group.id])
+        assert [group.name for group in server.allowed_promo_groups] == ['VIP']
+
+        # Без явного списка сервер привязывается к промогруппе по умолчанию
+        server = await create_server_squad(db, 'uuid-2', 'DE-1')
+        assert [group.id for group in server.allowed_promo_groups] == [default_group.id]
+
+
+async def test_update_server_squad_promo_groups_returns_loaded_promo_groups(sqlite_session):
+    async with sqlite_session(*TABLES) as db:
+        default_group, vip_group = await _seed_promo_groups(db)
+        server = await create_server_squad(db, 'uuid-1', 'NL-1')
+        db.expunge_all()
+
+        updated = await update_server_squad_promo_groups(db, server.id, [default_group.id, vip_group.id])
+        assert sorted(group.name for group in updated.allowed_promo_groups) == ['VIP', 'Базовая']
+
+        db.expunge_all()
+        reloaded = await get_server_squad_by_id(db, server.id)
+        assert sorted(group.name for group in reloaded.allowed_promo_groups) == ['VIP', 'Базовая']
+
+        assert await update_server_squad_promo_groups(db, 999, [vip_group.id]) is None
+
+
+async def test_allowed_promo_groups_are_not_lazy_loaded(sqlite_session):
+    async with sqlite_session(*TABLES) as db:
+        await _seed_promo_groups(db)
+        await create_server_squad(db, 'uuid-1', 'NL-1')
+        db.expunge_all()
+
+        server = (await db.execute(select(ServerSquad))).scalar_one()
+        with pytest.raises(InvalidRequestError):
+            _ = server.allowed_promo_groups
+
+
+async def test_orm_delete_does_not_load_subscription_servers(sqlite_session):
+    async with sqlite_session(*TABLES) as db:
+        await _seed_promo_groups(db)
+        await create_server_squad(db, 'uuid-1', 'NL-1')
+        db.expunge_all()
+        server = await get_server_squad_by_id(db, 1)
+
+        statements: list[str] = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.bind.sync_engine, 'before_cursor_execute', _record)
+        try:
+            await db.delete(server)
+            await db.commit()
+        finally:
+            event.remove(db.bind.sync_engine, 'before_cursor_execute', _record)
+
+        # Подключения к серверу охраняет FK в БД, ORM не выбирает их перед удалением
+        assert not [statement for statement in statements if 'FROM subscription_servers' in statement]
+        assert (await db.execute(select(ServerSquad))).first() is None
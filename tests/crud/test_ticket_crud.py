@@ -0,0 +1,191 @@
+"""Тесты CRUD сообщений тикетов."""
+
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import delete, select, text
+
+from app.database.crud.ticket import TicketCRUD, TicketMessageCRUD
+from app.database.models import PromoGroup, Ticket, TicketMessage, User
+
+
+TABLES = (User, Ticket, TicketMessage)
+
+
+def _message(ticket: Ticket, text: str, minutes: int) -> TicketMessage:
+    return TicketMessage(
+        ticket_id=ticket.id,
+        user_id=ticket.user_id,
+        message_text=text,
+        created_at=datetime(2026, 1, 1, tzinfo=UTC) + timedelta(minutes=minutes),
+    )
+
+
+async def test_get_last_messages_returns_newest_message_per_ticket(sqlite_session):
+    async with sqlite_session(*TABLES) as db:
+        user = User(telegram_id=111, first_name='User')
+        db.add(user)
+        await db.flush()
+        first, second, silent = (Ticket(user_id=user.id, title=title) for title in ('Первый', 'Второй', 'Пустой'))
+        db.add_all([first, second, silent])
+        await db.flush()
+        db.add_all(
+            [
+                _message(first, 'первое', 1),
+                _message(first, 'последнее', 5),
+                _message(first, 'среднее', 3),
+                _message(second, 'единственное', 2),
+            ]
+        )
+        await db.commit()
+
+        last_messages = await TicketMessageCRUD.get_last_messages(db, [first.id, second.id, silent.id])
+
+    assert {ticket_id: message.message_text for ticket_id, message in last_messages.items()} == {
+        first.id: 'последнее',
+        second.id: 'единственное',
+    }
+
+
+async def test_get_last_messages_empty_input(sqlite_session):
+    async with sqlite_session(*TABLES) as db:
+        assert await TicketMessageCRUD.get_last_messages(db, []) == {}
+
+
+async def test_insert_message_updates_ticket_stats_in_session(sqlite_session):
+    async with sqlite_session(*TABLES) as db:
+        user = User(telegram_id=111, first_name='User')
+        db.add(user)
+        await db.flush()
+        ticket = Ticket(user_id=user.id, title='Вопрос')
+        db.add(ticket)
+        await db.commit()
+        assert ticket.message_count == 0
+
+        message = await TicketMessageCRUD.insert_message(db, _message(ticket, 'привет', 1))
+        await TicketMessageCRUD.insert_message(
+            db, TicketMessage(ticket_id=ticket.id, user_id=user.id, message_text='ещё')
+        )
+
+        # Загруженный тикет обновлён сразу, до commit и без повторного чтения
+        assert ticket.message_count == 2
+        assert ticket.last_message_at is not None
+        assert ticket.last_message_at > message.created_at
+        await db.commit()
+
+        db.expunge_all()
+        stored = await db.get(Ticket, ticket.id)
+        assert stored.message_count == 2
+
+
+async def test_create_ticket_and_add_message_count_messages(sqlite_session):
+    async with sqlite_session(*TABLES) as db:
+        user = User(telegram_id=111, first_name='User')
+        db.add(user)
+        await db.commit()
+
+        ticket = await TicketCRUD.create_ticket(db, user.id, 'Не работает', 'Первое сообщение')
+        assert ticket.message_count == 1
+
+        reply = await TicketMessageCRUD.add_message(db, ticket.id, user.id, 'Ответ', is_from_admin=True)
+        assert ticket.message_count == 2
+        assert ticket.last_message_at == reply.created_at
+
+
+async def test_recalculate_ticket_stats_after_deleting_messages(sqlite_session):
+    async with sqlite_session(*TABLES) as db:
+        author = User(telegram_id=111, first_name='Author')
+        admin = User(telegram_id=222, first_name='Admin')
+        db.add_all([author, admin])
+        await db.flush()
+        ticket = Ticket(user_id=author.id, title='Вопрос')
+        db.add(ticket)
+        await db.flush()
+        await TicketMessageCRUD.insert_message(db, _message(ticket, 'вопрос', 1))
+        admin_reply = _message(ticket, 'ответ', 2)
+        admin_reply.user_id = admin.id
+        await TicketMessageCRUD.insert_message(db, admin_reply)
+        await db.commit()
+        assert ticket.message_count == 2
+
+        await db.execute(delete(TicketMessage).where(TicketMessage.user_id == admin.id))
+        await TicketMessageCRUD.recalculate_ticket_stats(db, [ticket.id])
+        await db.commit()
+
+        db.expunge_all()
+        stored = await db.get(Ticket, ticket.id)
+        assert stored.message_count == 1
+        assert stored.last_message_at == datetime(2026, 1, 1, tzinfo=UTC) + timedelta(minutes=1)
+
+        # Пустой список тикетов - ничего не делаем
+        await TicketMessageCRUD.recalculate_ticket_stats(db, [])
+
+
+async def test_insert_message_with_older_created_at_keeps_last_message_at(sqlite_session):
+    async with sqlite_session(*TABLES) as db:
+        user = User(telegram_id=111, first_name='User')
+        db.add(user)
+        await db.flush()
+        ticket = Ticket(user_id=user.id, title='Вопрос')
+        db.add(ticket)
+        await db.flush()
+
+        await TicketMessageCRUD.insert_message(db, _message(ticket, 'новое', 10))
+        await TicketMessageCRUD.insert_message(db, _message(ticket, 'из истории', 1))
+        await db.commit()
+
+        assert ticket.message_count == 2
+        assert ticket.last_message_at == datetime(2026, 1, 1, tzinfo=UTC) + timedelta(minutes=10)
+
+
+async def test_user_delete_cascade_recount_for_other_tickets(sqlite_session):
+    async with sqlite_session(PromoGroup, *TABLES) as db:
+        author = User(telegram_id=111, first_name='Author')
+        moderator = User(telegram_id=222, first_name='Moderator')
+        db.add_all([author, moderator])
+        await db.flush()
+        ticket = Ticket(user_id=author.id, title='Вопрос')
+        db.add(ticket)
+        await db.flush()
+        await TicketMessageCRUD.insert_message(db, _message(ticket, 'вопрос', 1))
+        answer = _message(ticket, 'ответ', 2)
+        answer.user_id = moderator.id
+        await TicketMessageCRUD.insert_message(db, answer)
+        await db.commit()
+
+        affected_ticket_ids = await TicketMessageCRUD.get_ticket_ids_with_user_messages(db, moderator.id)
+        assert affected_ticket_ids == [ticket.id]
+        await db.commit()
+        # Как в PostgreSQL: ON DELETE CASCADE удаляет сообщения удаляемого пользователя
+        await db.execute(text('PRAGMA foreign_keys=ON'))
+        await db.execute(delete(User).where(User.id == moderator.id))
+        await TicketMessageCRUD.recalculate_ticket_stats(db, affected_ticket_ids)
+        await db.commit()
+
+        assert ticket.message_count == 1
+        assert ticket.last_message_at == datetime(2026, 1, 1, tzinfo=UTC) + timedelta(minutes=1)
+
+
+async def test_recalculate_all_ticket_stats_after_restore(sqlite_session):
+    async with sqlite_session(*TABLES) as db:
+        user = User(telegram_id=111, first_name='User')
+        db.add(user)
+        await db.flush()
+        # Тикеты из бэкапа, снятого до появления счётчиков: message_count = 0
+        restored, empty = Ticket(user_id=user.id, title='Старый'), Ticket(user_id=user.id, title='Пустой')
+        db.add_all([restored, empty])
+        await db.flush()
+        db.add_all([_message(restored, 'первое', 1), _message(restored, 'второе', 2)])
+        await db.commit()
+
+        await TicketMessageCRUD.recalculate_ticket_stats(db)
+        await db.commit()
+
+        db.expunge_all()
+        stats = {
+            ticket.title: (ticket.message_count, ticket.last_message_at)
+            for ticket in (await db.execute(select(Ticket))).scalars()
+        }
+        assert stats == {
+            'Старый': (2, datetime(2026, 1, 1, tzinfo=UTC) + timedelta(minutes=2)),
+            'Пустой': (0, None),
+        }
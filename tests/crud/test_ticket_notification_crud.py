@@ -0,0 +1,120 @@
+"""Тесты CRUD уведомлений по тикетам в кабинете."""
+
+from datetime import UTC, datetime, timedelta
+
+from app.database.crud.ticket_notification import TicketNotificationCRUD
+from app.database.models import Ticket, TicketNotification, User
+
+
+TABLES = (User, Ticket, TicketNotification)
+
+
+async def _seed_ticket(db) -> tuple[User, User, Ticket]:
+    owner = User(telegram_id=111, first_name='Owner')
+    stranger = User(telegram_id=222, first_name='Stranger')
+    db.add_all([owner, stranger])
+    await db.flush()
+    ticket = Ticket(user_id=owner.id, title='Не работает VPN')
+    db.add(ticket)
+    await db.commit()
+    return owner, stranger, ticket
+
+
+def _notification(ticket: Ticket, *, is_for_admin: bool = False, is_read: bool = False, minutes: int = 0):
+    return TicketNotification(
+        ticket_id=ticket.id,
+        user_id=ticket.user_id,
+        notification_type='admin_reply',
+        is_for_admin=is_for_admin,
+        is_read=is_read,
+        created_at=datetime(2026, 1, 1, tzinfo=UTC) + timedelta(minutes=minutes),
+    )
+
+
+async def test_mark_as_read_scoped_to_owner(sqlite_session):
+    async with sqlite_session(*TABLES) as db:
+        owner, stranger, ticket = await _seed_ticket(db)
+        notification = _notification(ticket)
+        db.add(notification)
+        await db.commit()
+
+        assert await TicketNotificationCRUD.mark_as_read(db, notification.id, user_id=stranger.id) is False
+        await db.refresh(notification)
+        assert notification.is_read is False
+
+        assert await TicketNotificationCRUD.mark_as_read(db, notification.id, user_id=owner.id) is True
+        await db.refresh(notification)
+        assert notification.is_read is True
+        assert notification.read_at is not None
+
+
+async def test_mark_as_read_scoped_to_audience(sqlite_session):
+    async with sqlite_session(*TABLES) as db:
+        _, _, ticket = await _seed_ticket(db)
+        user_notification = _notification(ticket)
+        admin_notification = _notification(ticket, is_for_admin=True)
+        db.add_all([user_notification, admin_notification])
+        await db.commit()
+
+        # Админ не может отметить пользовательское уведомление через админский эндпоинт
+        assert await TicketNotificationCRUD.mark_as_read(db, user_notification.id, is_for_admin=True) is False
+        assert await TicketNotificationCRUD.mark_as_read(db, admin_notification.id, is_for_admin=True) is True
+        # Пользователь не может отметить админское уведомление, даже если оно по его тикету
+        assert (
+            await TicketNotificationCRUD.mark_as_read(
+                db, admin_notification.id, user_id=ticket.user_id, is_for_admin=False
+            )
+            is False
+        )
+
+
+async def test_mark_as_read_unknown_id(sqlite_session):
+    async with sqlite_session(*TABLES) as db:
+        await _seed_ticket(db)
+
+        assert await TicketNotificationCRUD.mark_as_read(db, 999) is False
+
+
+async def test_user_page_with_unread_count(sqlite_session):
+    async with sqlite_session(*TABLES) as db:
+        _, _, ticket = await _seed_ticket(db)
+        db.add_all(
+            [
+                _notification(ticket, minutes=1),
+                _notification(ticket, minutes=2, is_read=True),
+                _notification(ticket, minutes=3),
+                # Админские уведомления не попадают в выдачу и счётчик пользователя
+                _notification(ticket, minutes=4, is_for_admin=True),
+            ]
+        )
+        await db.commit()
+
+        page, unread = await TicketNotificationCRUD.get_user_notifications_with_unread_count(
+            db, ticket.user_id, limit=2
+        )
+        assert [n.created_at.minute for n in page] == [3, 2]
+        assert unread == 2
+        # Тикет подгружен вместе со страницей
+        assert page[0].ticket.title == 'Не работает VPN'
+
+        # Счётчик не зависит от смещения и фильтра непрочитанных
+        page, unread = await TicketNotificationCRUD.get_user_notifications_with_unread_count(
+            db, ticket.user_id, unread_only=True, limit=1, offset=1
+        )
+        assert [n.created_at.minute for n in page] == [1]
+        assert unread == 2
+
+
+async def test_empty_page_still_returns_unread_count(sqlite_session):
+    async with sqlite_session(*TABLES) as db:
+        _, _, ticket = await _seed_ticket(db)
+        db.add_all([_notification(ticket, is_for_admin=True, minutes=m) for m in range(3)])
+        await db.commit()
+
+        page, unread = await TicketNotificationCRUD.get_admin_notifications_with_unread_count(db, offset=10)
+        assert page == []
+        assert unread == 3
+
+        page, unread = await TicketNotificationCRUD.get_user_notifications_with_unread_count(db, ticket.user_id)
+        assert page == []
+        assert unread == 0
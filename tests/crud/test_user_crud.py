@@ -0,0 +1,42 @@
+"""Тесты пакетного поиска пользователей по telegram_id и username."""
+
+from app.database.crud.user import get_users_by_telegram_ids_or_usernames
+from app.database.models import User
+
+
+async def _seed_users(db) -> None:
+    db.add_all(
+        [
+            User(telegram_id=111, username='Alice', first_name='Alice'),
+            User(telegram_id=222, username='bob', first_name='Bob'),
+            User(telegram_id=333, username=None, first_name='NoName'),
+            User(telegram_id=None, username='email_only', first_name='Email'),
+        ]
+    )
+    await db.commit()
+
+
+async def test_mixed_ids_and_usernames_resolved_in_one_call(sqlite_session):
+    async with sqlite_session(User) as db:
+        await _seed_users(db)
+
+        users = await get_users_by_telegram_ids_or_usernames(db, {111, 333}, {'BOB', 'email_only'})
+
+    assert sorted(user.first_name for user in users) == ['Alice', 'Bob', 'Email', 'NoName']
+
+
+async def test_username_match_is_case_insensitive(sqlite_session):
+    async with sqlite_session(User) as db:
+        await _seed_users(db)
+
+        users = await get_users_by_telegram_ids_or_usernames(db, set(), {'alice'})
+
+    assert [user.telegram_id for user in users] == [111]
+
+
+async def test_unknown_tokens_return_nothing(sqlite_session):
+    async with sqlite_session(User) as db:
+        await _seed_users(db)
+
+        assert await get_users_by_telegram_ids_or_usernames(db, {999}, {'ghost'}) == []
+        assert await get_users_by_telegram_ids_or_usernames(db, set(), set()) == []
@@ -0,0 +1,122 @@
+"""Тесты буферизованной записи кликов по кнопкам."""
+
+import asyncio
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.database.models import ButtonClickLog, User
+from app.services.menu_layout import click_buffer
+from app.services.menu_layout.click_buffer import ButtonClickBuffer
+
+
+TABLES = (User, ButtonClickLog)
+
+
+def _use_session(monkeypatch, db) -> None:
+    monkeypatch.setattr(click_buffer, 'AsyncSessionLocal', async_sessionmaker(db.bind, expire_on_commit=False))
+
+
+async def _logged_clicks(db) -> list[tuple[str, int | None]]:
+    result = await db.execute(select(ButtonClickLog.button_id, ButtonClickLog.user_id).order_by(ButtonClickLog.id))
+    return [tuple(row) for row in result.all()]
+
+
+async def test_flush_writes_in_chunks_of_max_batch_size(sqlite_session, monkeypatch):
+    async with sqlite_session(*TABLES) as db:
+        _use_session(monkeypatch, db)
+        buffer = ButtonClickBuffer(flush_interval=60, max_batch_size=2)
+
+        inserts: list[str] = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith('INSERT INTO button_click_logs'):
+                inserts.append(statement)
+
+        event.listen(db.bind.sync_engine, 'before_cursor_execute', _record)
+        try:
+            for index in range(5):
+                buffer.add(f'button_{index}')
+            await buffer.flush()
+        finally:
+            event.remove(db.bind.sync_engine, 'before_cursor_execute', _record)
+            await buffer.stop()
+
+        assert len(inserts) == 3
+        assert [button_id for button_id, _ in await _logged_clicks(db)] == [f'button_{index}' for index in range(5)]
+
+
+async def test_background_flush_after_interval(sqlite_session, monkeypatch):
+    async with sqlite_session(*TABLES) as db:
+        _use_session(monkeypatch, db)
+        buffer = ButtonClickBuffer(flush_interval=0.01)
+
+        buffer.add('menu')
+        try:
+            for _ in range(100):
+                if await _logged_clicks(db):
+                    break
+                await asyncio.sleep(0.01)
+            assert await _logged_clicks(db) == [('menu', None)]
+        finally:
+            await buffer.stop()
+
+
+async def test_stop_drains_pending_clicks_without_waiting_interval(sqlite_session, monkeypatch):
+    async with sqlite_session(*TABLES) as db:
+        _use_session(monkeypatch, db)
+        buffer = ButtonClickBuffer(flush_interval=60)
+
+        buffer.add('menu')
+        buffer.add('profile')
+        await asyncio.wait_for(buffer.stop(), timeout=1)
+
+        assert await _logged_clicks(db) == [('menu', None), ('profile', None)]
+
+
+async def test_telegram_and_internal_ids_are_resolved_separately(sqlite_session, monkeypatch):
+    async with sqlite_session(*TABLES) as db:
+        _use_session(monkeypatch, db)
+        first = User(telegram_id=2, first_name='First')
+        second = User(telegram_id=1000, first_name='Second')
+        db.add_all([first, second])
+        await db.commit()
+        assert (first.id, second.id) == (1, 2)
+
+        buffer = ButtonClickBuffer(flush_interval=60)
+        # telegram_id=2 совпадает с internal id второго пользователя, но относится к первому
+        buffer.add('by_telegram', telegram_id=2)
+        buffer.add('by_internal', user_id=2)
+        buffer.add('unknown_telegram', telegram_id=999)
+        buffer.add('unknown_internal', user_id=999)
+        await buffer.stop()
+
+        assert await _logged_clicks(db) == [
+            ('by_telegram', first.id),
+            ('by_internal', second.id),
+            ('unknown_telegram', None),
+            ('unknown_internal', None),
+        ]
+
+
+async def test_failed_batch_is_requeued_once_within_limit(sqlite_session, monkeypatch):
+    async with sqlite_session(User) as db:
+        _use_session(monkeypatch, db)
+        buffer = ButtonClickBuffer(flush_interval=60, max_pending=3)
+
+        buffer.add('first')
+        buffer.add('second')
+        # Таблицы кликов нет - запись падает, пачка возвращается в очередь
+        await buffer.flush()
+        assert [row['button_id'] for row in buffer._pending] == ['first', 'second']
+
+        buffer.add('third')
+        # Повторно клики в очередь не возвращаются, иначе недоступная БД держала бы их вечно
+        await buffer.flush()
+        assert [row['button_id'] for row in buffer._pending] == ['third']
+
+        async with db.bind.begin() as conn:
+            await conn.run_sync(ButtonClickLog.__table__.create)
+        await buffer.stop()
+
+        assert await _logged_clicks(db) == [('third', None)]
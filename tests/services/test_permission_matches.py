@@ -0,0 +1,33 @@
+"""Tests for permission pattern matching in app.services.permission_service."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.permission_service import _policy_matches_resource, permission_matches
+
+
+@pytest.mark.parametrize(
+    ('user_perm', 'required_perm', 'expected'),
+    [
+        ('*:*', 'users:read', True),
+        ('users:*', 'users:read', True),
+        ('users:*', 'tickets:read', False),
+        ('users:read', 'users:read', True),
+        ('users:read', 'users:edit', False),
+        ('users:read', 'users:read_all', False),
+        ('users:?ead', 'users:read', True),
+    ],
+)
+def test_permission_matches(user_perm: str, required_perm: str, expected: bool) -> None:
+    assert permission_matches(user_perm, required_perm) is expected
+
+
+def test_policy_matches_resource() -> None:
+    policy = SimpleNamespace(resource='users', actions=['read', 'edit*'])
+
+    assert _policy_matches_resource(policy, 'users:read')
+    assert _policy_matches_resource(policy, 'users:edit_balance')
+    assert not _policy_matches_resource(policy, 'users:delete')
+    assert not _policy_matches_resource(policy, 'tickets:read')
+    assert not _policy_matches_resource(policy, 'users')
@@ -0,0 +1,43 @@
+"""Тесты записи результатов доставки webhooks."""
+
+from sqlalchemy import select
+
+from app.database.models import Webhook, WebhookDelivery
+from app.services.webhook_service import DeliveryResult, WebhookService
+
+
+TABLES = (Webhook, WebhookDelivery)
+
+
+async def test_failed_delivery_record_does_not_roll_back_others(sqlite_session):
+    async with sqlite_session(*TABLES) as db:
+        first, broken, last = (
+            Webhook(name=name, url=f'https://example.com/{name}', event_type='user.created')
+            for name in ('first', 'broken', 'last')
+        )
+        db.add_all([first, broken, last])
+        await db.commit()
+
+        results = [
+            DeliveryResult(webhook=first, event_type='user.created', payload={'id': 1}, status='success'),
+            # event_type NOT NULL - запись этой доставки падает при flush на любой БД
+            DeliveryResult(webhook=broken, event_type=None, payload={'id': 1}, status='success'),
+            DeliveryResult(
+                webhook=last,
+                event_type='user.created',
+                payload={'id': 1},
+                status='failed',
+                error_message='HTTP 500',
+            ),
+        ]
+        await WebhookService()._record_results(db, results)
+
+        db.expunge_all()
+        deliveries = (await db.execute(select(WebhookDelivery.webhook_id, WebhookDelivery.status))).all()
+        assert sorted(deliveries) == sorted([(first.id, 'success'), (last.id, 'failed')])
+
+        stats = {
+            webhook.name: (webhook.success_count, webhook.failure_count)
+            for webhook in (await db.execute(select(Webhook))).scalars()
+        }
+        assert stats == {'first': (1, 0), 'broken': (0, 0), 'last': (0, 1)}
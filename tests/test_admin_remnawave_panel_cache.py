@@ -0,0 +1,80 @@
+"""Тесты кеша списков нод и сквадов RemnaWave в админке кабинета."""
+
+import asyncio
+
+import pytest
+
+from app.cabinet.routes import admin_remnawave
+
+
+@pytest.fixture(autouse=True)
+def _reset_panel_cache():
+    admin_remnawave._panel_list_cache.clear()
+    admin_remnawave._panel_list_inflight.clear()
+    yield
+    admin_remnawave._panel_list_cache.clear()
+    admin_remnawave._panel_list_inflight.clear()
+
+
+async def test_concurrent_callers_share_one_load():
+    calls = 0
+    release = asyncio.Event()
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return [{'uuid': 'squad-1'}]
+
+    first = asyncio.create_task(admin_remnawave._get_cached_panel_list('squads', loader))
+    second = asyncio.create_task(admin_remnawave._get_cached_panel_list('squads', loader))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await first == [{'uuid': 'squad-1'}]
+    assert await second == [{'uuid': 'squad-1'}]
+    assert calls == 1
+
+    # Повторный запрос в пределах TTL берётся из кеша
+    assert await admin_remnawave._get_cached_panel_list('squads', loader) == [{'uuid': 'squad-1'}]
+    assert calls == 1
+
+
+async def test_invalidation_during_load_does_not_cache_stale_data():
+    release_stale = asyncio.Event()
+    responses = [[{'uuid': 'old'}], [{'uuid': 'new'}]]
+
+    async def loader():
+        items = responses.pop(0)
+        if items == [{'uuid': 'old'}]:
+            await release_stale.wait()
+        return items
+
+    stale_request = asyncio.create_task(admin_remnawave._get_cached_panel_list('squads', loader))
+    await asyncio.sleep(0)
+
+    admin_remnawave._invalidate_panel_lists()
+
+    # Запрос после изменения не присоединяется к старой загрузке
+    fresh = await asyncio.wait_for(admin_remnawave._get_cached_panel_list('squads', loader), timeout=1)
+    assert fresh == [{'uuid': 'new'}]
+
+    release_stale.set()
+    assert await stale_request == [{'uuid': 'old'}]
+    await asyncio.sleep(0)
+
+    assert admin_remnawave._panel_list_cache['squads'][1] == [{'uuid': 'new'}]
+    assert await admin_remnawave._get_cached_panel_list('squads', loader) == [{'uuid': 'new'}]
+
+
+async def test_empty_result_is_not_cached():
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        return []
+
+    assert await admin_remnawave._get_cached_panel_list('nodes', loader) == []
+    assert await admin_remnawave._get_cached_panel_list('nodes', loader) == []
+    assert calls == 2